@@ -1,7 +1,11 @@
+import os
 import pygame as pg
-import random
-import copy
-import time as time
+import sudoku_core as core       # Modelo, verificação, solvers e gerador (sem pygame, 9x9 por padrão)
+from sudoku_core import EMPTY, new_board, ConflictTracker, generate_puzzle
+from sudoku_jobs import SolveJob, PORTFOLIO  # Solve/Check em processos separados (variantes em paralelo)
+from sudoku_cache import SolutionCache  # Soluções já encontradas, por forma canônica
+from sudoku_store import open_store     # Puzzles pré-gerados em arquivo binário (mmap)
+import sudoku_render as render   # Textos e grade pré-renderizados
 
 # ------------------------ CONFIG ------------------------ #
 WINDOW_SIZE   = (1000, 700)      # Tamanho da janela principal
@@ -9,6 +13,11 @@ BOARD_TOPLEFT = (50, 50)         # Coordenadas de início do tabuleiro (canto su
 CELL_SIZE     = 67               # Tamanho de cada célula do tabuleiro
 GRID_SIZE     = CELL_SIZE * 9    # Tamanho total da grade (9x9 células)
 FPS           = 60               # Taxa de atualização (frames por segundo)
+SOLVE_TIMEOUT = 30.0             # Segundos até o Solve/Check desistir
+ANIM_SLICE    = 0.004            # Segundos de busca por quadro na animação (tecla A), para não perder quadros
+CACHE_FILE    = os.path.expanduser("~/.sudoku_solucoes.json")  # Cache de soluções entre execuções
+STORE_FILE    = os.path.expanduser("~/.sudoku_puzzles.sdk")    # Opcional: sudoku_store.py build
+WINS_FILE     = os.path.expanduser("~/.sudoku_portfolio.jsonl")  # Estratégia vencedora de cada Solve
 
 # Tabela de cores
 WHITE    = (245, 245, 245)
@@ -21,145 +30,63 @@ SKY      = (220, 230, 250)
 BLUE     = (80, 130, 255)
 RED      = (200, 60, 60)
 
-# -------------------- PYGAME INIT ---------------------- #
-pg.init()
-window = pg.display.set_mode(WINDOW_SIZE)                    # Cria a janela do jogo
-pg.display.set_caption("Sudoku – Maicon Alves e Leonardo Marcondeli")          # Define o título da janela
-clock = pg.time.Clock()                                      # Controla a taxa de frames
-
-pg.font.init()
-BIG   = pg.font.SysFont("Segoe UI", 48, bold=True)           # Fonte grande para os números
-SMALL = pg.font.SysFont("Segoe UI", 28)                      # Fonte pequena para botões e mensagens
-
 # ----------------------- DATA -------------------------- #
-EMPTY = "n"  # Valor que representa uma célula vazia
-
-def new_board():
-    # Cria um tabuleiro 9x9 vazio
-    return [[EMPTY for _ in range(9)] for _ in range(9)]
-
 board         = new_board()      # Estado atual do tabuleiro
+conflicts     = ConflictTracker(board)  # Contagem de dígitos por linha/coluna/bloco, atualizada a cada tecla
 input_locked  = False            # Indica se o tabuleiro está bloqueado (ex: após resolver)
 message       = ""               # Mensagem a ser exibida ao jogador
 msg_color     = GREEN            # Cor da mensagem
 selected      = (-1, -1)         # Célula atualmente selecionada
 
 game_phase    = "menu"           # Fase atual do jogo: "menu" ou "play"
-
-# ------------------ SUDOKU HELPERS --------------------- #
-def row(b, y): return b[y]                         # Retorna uma linha
-
-def col(b, x): return [b[i][x] for i in range(9)] # Retorna uma coluna
-
-def block(b, x, y):                                # Retorna o bloco 3x3 da célula (x, y)
-    bx, by = (x//3)*3, (y//3)*3
-    return [b[j][i] for j in range(by, by+3) for i in range(bx, bx+3)]
-
-def valid_number(b, x, y, n):                      # Verifica se n pode ser colocado em (x, y)
-    return n not in row(b, y) and n not in col(b, x) and n not in block(b, x, y)
-
-def is_board_consistent(b):                        # Verifica se não há conflitos no tabuleiro
-    for y in range(9):
-        vals = [v for v in row(b, y) if v != EMPTY]
-        if len(vals) != len(set(vals)):
-            return False
-    for x in range(9):
-        vals = [b[y][x] for y in range(9) if b[y][x] != EMPTY]
-        if len(vals) != len(set(vals)):
-            return False
-    for by in range(0, 9, 3):
-        for bx in range(0, 9, 3):
-            vals = [b[yy][xx] for yy in range(by, by+3) for xx in range(bx, bx+3) if b[yy][xx] != EMPTY]
-            if len(vals) != len(set(vals)):
-                return False
-    return True
-
-def solve_backtracking(b, randomize=False):        # Algoritmo de backtracking para resolver o tabuleiro
-    global solve_attempts  # <- necessário para contar corretamente
-    for y in range(9):
-        for x in range(9):
-            if b[y][x] == EMPTY:
-                nums = list(range(1, 10))
-                if randomize:
-                    random.shuffle(nums)
-                for n in nums:
-                    if valid_number(b, x, y, n):
-                        solve_attempts += 1  # <-- conta tentativa
-                        b[y][x] = n
-                        if solve_backtracking(b, randomize):
-                            return True
-                        b[y][x] = EMPTY
-                return False
-    return True
-
-def generate_puzzle(clues=35):                     # Gera um tabuleiro com "clues" pistas
-    full = new_board()
-    solve_backtracking(full, randomize=True)
-    puzzle = copy.deepcopy(full)
-    cells = list(range(81))
-    random.shuffle(cells)
-    for _ in range(81 - clues):
-        idx = cells.pop()
-        y, x = divmod(idx, 9)
-        puzzle[y][x] = EMPTY
-    return puzzle
+solve_job     = None             # Solve em andamento (enquanto isso Clear vira Cancelar)
+solve_clues   = None             # Pistas do solve em andamento (chave do cache)
+animation     = None             # StepSolver animado no tabuleiro (tecla A; Clear vira Cancelar)
+prev_view     = {}               # Estado desenhado no último quadro (para os dirty rects)
+drawn_phase   = None             # Tela do último quadro; trocar de tela força quadro cheio
+full_redraw   = True             # Próximo quadro inteiro (início, troca de tela, janela exposta, animação)
 
 # ----------------------- DRAWERS ----------------------- #
-def draw_board(surf):                              # Desenha o tabuleiro e as linhas
+def draw_board(surf):                              # Desenha o fundo com a grade (pronta em GRID_SURF)
+    surf.blit(GRID_SURF, (0, 0))
+
+def cell_rect(x, y):                               # Retângulo da célula (x, y) na tela
     bx, by = BOARD_TOPLEFT
-    surf.fill(WHITE)
-    pg.draw.rect(surf, DARKGRAY, (bx, by, GRID_SIZE, GRID_SIZE), 4)
-    for i in range(1, 3):
-        pg.draw.line(surf, DARKGRAY, (bx, by + i*CELL_SIZE*3), (bx + GRID_SIZE, by + i*CELL_SIZE*3), 4)
-        pg.draw.line(surf, DARKGRAY, (bx + i*CELL_SIZE*3, by), (bx + i*CELL_SIZE*3, by + GRID_SIZE), 4)
-    for i in range(1, 9):
-        if i % 3:
-            pg.draw.line(surf, GRAY, (bx, by + i*CELL_SIZE), (bx + GRID_SIZE, by + i*CELL_SIZE), 1)
-            pg.draw.line(surf, GRAY, (bx + i*CELL_SIZE, by), (bx + i*CELL_SIZE, by + GRID_SIZE), 1)
-
-def draw_numbers(surf):                            # Desenha os números dentro das células
+    return pg.Rect(bx + x*CELL_SIZE, by + y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+def hovered_cell():                                # Célula sob o mouse (ou None)
+    mx, my = pg.mouse.get_pos()
     bx, by = BOARD_TOPLEFT
+    if bx <= mx < bx+GRID_SIZE and by <= my < by+GRID_SIZE:
+        return ((mx-bx)//CELL_SIZE, (my-by)//CELL_SIZE)
+    return None
+
+def draw_numbers(surf, area=None):                 # Desenha os números (só os que encostam em area, se houver)
     for y in range(9):
         for x in range(9):
             val = board[y][x]
-            if val != EMPTY:
-                img = BIG.render(str(val), True, BLACK)
-                img_rect = img.get_rect(center=(bx + x*CELL_SIZE + CELL_SIZE//2, by + y*CELL_SIZE + CELL_SIZE//2))
+            if val != EMPTY and (area is None or cell_rect(x, y).colliderect(area)):
+                img = GLYPHS_BAD[val] if conflicts.conflicting(x, y) else GLYPHS[val]  # Repetido → vermelho
+                img_rect = img.get_rect(center=cell_rect(x, y).center)
                 surf.blit(img, img_rect)
 
 def highlight_cell(surf, x, y, color):             # Destaca uma célula com uma cor
-    bx, by = BOARD_TOPLEFT
-    pg.draw.rect(surf, color, (bx + x*CELL_SIZE, by + y*CELL_SIZE, CELL_SIZE, CELL_SIZE), border_radius=4)
+    pg.draw.rect(surf, color, cell_rect(x, y), border_radius=4)
 
 def draw_button(surf, rect, text):                 # Desenha um botão com texto centralizado
     mouse = pg.mouse.get_pos()
     hovered = rect.collidepoint(mouse)
     color = L_GREEN if hovered else GREEN
     pg.draw.rect(surf, color, rect, border_radius=12)
-    lbl = SMALL.render(text, True, WHITE)
+    lbl = render.label(SMALL, text, WHITE)
     surf.blit(lbl, (rect.x + (rect.width - lbl.get_width())//2, rect.y + (rect.height - lbl.get_height())//2))
 
 def draw_message(surf):
     if message:
-        # Quebra em várias linhas se o texto for muito longo
-        lines = []
-        words = message.split()
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if SMALL.size(test_line)[0] < 250:  # Limite de largura
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        lines.append(current_line)  # Última linha
+        x, y = MESSAGE_RECT.topleft  # Alinhado com os botões da direita, abaixo deles
 
-        x = 700  # Alinhado com os botões da direita
-        y = 270  # Começa abaixo dos botões
-
-        for i, line in enumerate(lines):
-            lbl = SMALL.render(line, True, msg_color)
+        for i, line in enumerate(render.wrap(SMALL, message, 250)):  # Quebra em linhas de até 250 px
+            lbl = render.label(SMALL, line, msg_color)
             surf.blit(lbl, (x, y + i * 30))  # 30 px de espaçamento vertical por linha
 
 # ---------- MENU DRAW ---------- #
@@ -168,96 +95,234 @@ MENU_CUSTOM_RECT = pg.Rect(300, 320, 400, 80)
 
 def draw_menu(surf):                               # Tela de menu com opções de jogo
     surf.fill(WHITE)
-    title = BIG.render("Escolha o modo", True, BLACK)
+    title = render.label(BIG, "Escolha o modo", BLACK)
     surf.blit(title, ((WINDOW_SIZE[0]-title.get_width())//2, 80))
     draw_button(surf, MENU_RANDOM_RECT, "Puzzle Aleatório")
     draw_button(surf, MENU_CUSTOM_RECT, "Montar Manualmente")
 
 # ---------- GAME BUTTONS ---------- #
-SOLVE_RECT = pg.Rect(700, 50, 250, 80)
-CLEAR_RECT = pg.Rect(700, 150, 250, 80)
+SOLVE_RECT   = pg.Rect(700, 50, 250, 80)
+CLEAR_RECT   = pg.Rect(700, 150, 250, 80)
+MESSAGE_RECT = pg.Rect(700, 270, 300, 430)        # Área onde draw_message escreve
+
+def game_buttons():                                # Botões da tela de jogo com o texto atual
+    return [(SOLVE_RECT, "Solve / Check"), (CLEAR_RECT, "Cancelar" if solve_job or animation else "Clear Board")]
+
+def draw_play(surf, area=None):                    # Tela de jogo inteira, ou só o recorte area (dirty rect)
+    surf.set_clip(area)
+    if area is None:
+        draw_board(surf)
+    else:
+        surf.blit(GRID_SURF, area, area)
+    near = area.inflate(2*CELL_SIZE, 2*CELL_SIZE) if area else None  # Números vizinhos podem invadir o recorte
+    hover = hovered_cell()
+    if hover and (area is None or cell_rect(*hover).colliderect(near)):
+        highlight_cell(surf, *hover, SKY)
+    if selected != (-1, -1) and (area is None or cell_rect(*selected).colliderect(near)):
+        highlight_cell(surf, *selected, BLUE)
+    draw_numbers(surf, near)
+    for rect, text in game_buttons():
+        if area is None or rect.colliderect(area):
+            draw_button(surf, rect, text)
+    if area is None or MESSAGE_RECT.colliderect(area):
+        draw_message(surf)
+    surf.set_clip(None)
+
+def current_view():                                # Estado visível de cada região: {chave: (rect, estado)}
+    mouse = pg.mouse.get_pos()
+    if game_phase == "menu":
+        return {r.topleft: (r, r.collidepoint(mouse)) for r in (MENU_RANDOM_RECT, MENU_CUSTOM_RECT)}
+    hover = hovered_cell()
+    view = {(x, y): (cell_rect(x, y), (board[y][x], conflicts.conflicting(x, y), (x, y) == hover, (x, y) == selected))
+            for y in range(9) for x in range(9)}
+    for rect, text in game_buttons():
+        view[rect.topleft] = (rect, (text, rect.collidepoint(mouse)))
+    view["msg"] = (MESSAGE_RECT, (message, msg_color))
+    return view
 
 # ---------------- MAIN LOOP -------------------------- #
-running = True
-while running:
-    for ev in pg.event.get():
-        if ev.type == pg.QUIT:
-            running = False
-
-        if game_phase == "menu":
-            if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
-                if MENU_RANDOM_RECT.collidepoint(ev.pos):
-                    solve_attempts = 0
-                    board = generate_puzzle(clues=35)
-                    game_phase = "play"
-                    message = ""
-                    input_locked = False
-                elif MENU_CUSTOM_RECT.collidepoint(ev.pos):
-                    board = new_board()
-                    game_phase = "play"
-                    message = "Insira suas pistas e clique Solve"
-                    msg_color = BLACK
-                    input_locked = False
-            continue
-
-        if game_phase == "play":
-            if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
-                mx, my = ev.pos
-                bx, by = BOARD_TOPLEFT
-                if bx <= mx <= bx+GRID_SIZE and by <= my <= by+GRID_SIZE and not input_locked:
-                    selected = ((mx-bx)//CELL_SIZE, (my-by)//CELL_SIZE)
-                else:
-                    selected = (-1, -1)
-
-                if SOLVE_RECT.collidepoint(ev.pos):
-                    if is_board_consistent(board):
-                        temp = copy.deepcopy(board)
-                        start_time = time.time()
-                        solve_attempts = 0
-                        if solve_backtracking(temp):
-                            elapsed = time.time() - start_time
-                            board[:] = temp
-                            message = f"Resolvido em {elapsed:.5f}s ({solve_attempts} tentativas)"
+if __name__ == "__main__":
+    # -------------------- PYGAME INIT ---------------------- #
+    pg.init()
+    window = pg.display.set_mode(WINDOW_SIZE)                    # Cria a janela do jogo
+    pg.display.set_caption("Sudoku – Maicon Alves e Leonardo Marcondeli")          # Define o título da janela
+    clock = pg.time.Clock()                                      # Controla a taxa de frames
+
+    pg.font.init()
+    BIG   = pg.font.SysFont("Segoe UI", 48, bold=True)           # Fonte grande para os números
+    SMALL = pg.font.SysFont("Segoe UI", 28)                      # Fonte pequena para botões e mensagens
+
+    GRID_SURF  = render.grid_surface(WINDOW_SIZE, BOARD_TOPLEFT, 9, CELL_SIZE, 3, 3,
+                                     WHITE, GRAY, DARKGRAY)      # Fundo + grade, desenhados uma vez
+    GLYPHS     = render.glyph_atlas(BIG, 9, BLACK)               # Dígitos 1..9 pré-renderizados
+    GLYPHS_BAD = render.glyph_atlas(BIG, 9, RED)                 # Os mesmos, para dígitos em conflito
+    cache      = SolutionCache(path=CACHE_FILE)                  # Consultado antes de cada busca
+    store      = open_store(STORE_FILE)                          # None se não houver arquivo de puzzles
+
+    running = True
+    while running:
+        # Ocioso: dorme até o próximo evento; com um solve rodando acorda a cada 100 ms
+        if full_redraw or animation:                 # Animando: um quadro por tick, sem esperar evento
+            events = pg.event.get()
+        elif solve_job:
+            events = [pg.event.wait(100)] + pg.event.get()
+        else:
+            events = [pg.event.wait()] + pg.event.get()
+
+        for ev in events:
+            if ev.type == pg.QUIT:
+                running = False
+            if ev.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                full_redraw = True
+
+            if game_phase == "menu":
+                if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
+                    if MENU_RANDOM_RECT.collidepoint(ev.pos):
+                        stored = store and store.random(9)               # Sorteio direto do arquivo, se houver
+                        board = core.from_flat(stored) if stored else generate_puzzle(clues=35, unique=True)
+                        conflicts = ConflictTracker(board)
+                        game_phase = "play"
+                        message = ""
+                        input_locked = False
+                    elif MENU_CUSTOM_RECT.collidepoint(ev.pos):
+                        board = new_board()
+                        conflicts = ConflictTracker(board)
+                        game_phase = "play"
+                        message = "Insira suas pistas e clique Solve (A anima)"
+                        msg_color = BLACK
+                        input_locked = False
+                continue
+
+            if game_phase == "play":
+                if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
+                    mx, my = ev.pos
+                    bx, by = BOARD_TOPLEFT
+                    if bx <= mx <= bx+GRID_SIZE and by <= my <= by+GRID_SIZE and not input_locked:
+                        selected = ((mx-bx)//CELL_SIZE, (my-by)//CELL_SIZE)
+                    else:
+                        selected = (-1, -1)
+
+                    if SOLVE_RECT.collidepoint(ev.pos) and not (solve_job or animation):
+                        hit = cache.get(board) if conflicts.consistent() else None  # O(1): contagens mantidas a cada tecla
+                        if hit:
+                            board[:] = core.from_flat(hit)   # Mesmo puzzle (ou equivalente) já resolvido
+                            conflicts = ConflictTracker(board)
+                            message = "Resolvido (solução em cache)."
                             msg_color = GREEN
+                            selected = (-1, -1)
+                            input_locked = True
+                        elif conflicts.consistent():
+                            solve_clues = core.to_flat(board)
+                            solve_job = SolveJob(board, timeout=SOLVE_TIMEOUT, strategies=PORTFOLIO, log=WINS_FILE)  # Corrida entre variantes
+                            message = "Resolvendo…"
+                            msg_color = BLACK
+                            selected = (-1, -1)
                             input_locked = True
                         else:
-                            message = "Sem solução."
+                            message = "Conflitos nas pistas!"
                             msg_color = RED
+
+                    if CLEAR_RECT.collidepoint(ev.pos):
+                        if solve_job:
+                            solve_job.cancel()   # Botão vira "Cancelar" durante o solve
+                        elif animation:
+                            core.copy_into(board, solve_clues)  # Volta às pistas
+                            animation = None
+                            message = "Animação cancelada."
+                            msg_color = RED
+                            input_locked = False
+                        else:
+                            board = new_board()
+                            conflicts = ConflictTracker(board)
+                            message = ""
+                            input_locked = False
+
+                if ev.type == pg.KEYDOWN and ev.key == pg.K_a and not input_locked and not (solve_job or animation):
+                    if conflicts.consistent():
+                        solve_clues = core.to_flat(board)
+                        animation = core.StepSolver(core.to_flat(board), mrv=True)  # Busca em fatias, quadro a quadro
+                        selected = (-1, -1)
+                        input_locked = True
                     else:
                         message = "Conflitos nas pistas!"
                         msg_color = RED
 
-                if CLEAR_RECT.collidepoint(ev.pos):
-                    board = new_board()
-                    message = ""
-                    input_locked = False
-
-            if ev.type == pg.KEYDOWN and selected != (-1, -1) and not input_locked:
-                key = pg.key.name(ev.key)
-                sx, sy = selected
-                if key in "123456789":
-                    board[sy][sx] = int(key)
-                elif ev.key in (pg.K_BACKSPACE, pg.K_SPACE):
-                    board[sy][sx] = EMPTY
-
-    # ---------------- RENDER ---------------- #
-    if game_phase == "menu":
-        draw_menu(window)
-    else:
-        draw_board(window)
-        mx, my = pg.mouse.get_pos()
-        bx, by = BOARD_TOPLEFT
-        if bx <= mx <= bx+GRID_SIZE and by <= my <= by+GRID_SIZE:
-            hx, hy = (mx-bx)//CELL_SIZE, (my-by)//CELL_SIZE
-            highlight_cell(window, hx, hy, SKY)
-        if selected != (-1, -1):
-            highlight_cell(window, *selected, BLUE)
-        draw_numbers(window)
-        draw_button(window, SOLVE_RECT, "Solve / Check")
-        draw_button(window, CLEAR_RECT, "Clear Board")
-        draw_message(window)
-
-    pg.display.flip()
-    clock.tick(FPS)
-
-pg.quit()
\ No newline at end of file
+                if ev.type == pg.KEYDOWN and selected != (-1, -1) and not input_locked:
+                    key = pg.key.name(ev.key)
+                    sx, sy = selected
+                    if key in "123456789":
+                        conflicts.set(sx, sy, int(key))
+                    elif ev.key in (pg.K_BACKSPACE, pg.K_SPACE):
+                        conflicts.set(sx, sy, EMPTY)
+
+        # ------------- SOLVE EM ANDAMENTO ------------- #
+        if solve_job:
+            status = solve_job.poll()
+            if status is None:
+                message = f"Resolvendo… {solve_job.attempts} tentativas, profundidade {solve_job.depth} ({solve_job.elapsed:.1f}s)"
+            elif status == "solved":
+                board[:] = solve_job.solution
+                conflicts = ConflictTracker(board)
+                cache.put(solve_clues, board)
+                message = f"Resolvido em {solve_job.elapsed:.5f}s por {solve_job.winner} ({solve_job.attempts} tentativas, {solve_job.backtracks} retrocessos)"
+                msg_color = GREEN
+            else:
+                if status == "timeout":
+                    message = f"Tempo esgotado ({SOLVE_TIMEOUT:.0f}s)."
+                elif status == "cancelled":
+                    message = "Busca cancelada."
+                elif status == "error":
+                    message = f"Erro no solver (código {solve_job.exitcode})."
+                else:
+                    message = "Sem solução."
+                msg_color = RED
+                input_locked = False
+            if status:
+                solve_job = None
+
+        # ------------- ANIMAÇÃO (tecla A) ------------- #
+        if animation:
+            status = animation.run(budget=ANIM_SLICE)
+            core.copy_into(board, animation.board if status is not False else solve_clues)
+            if status is None:
+                message = f"Animando… {animation.steps} passos, profundidade {len(animation.stack)}"
+                msg_color = BLACK
+            elif status:
+                conflicts = ConflictTracker(board)
+                cache.put(solve_clues, board)
+                message = f"Resolvido em {animation.steps} passos ({animation.stats.backtracks} retrocessos)"
+                msg_color = GREEN
+            else:
+                message = "Sem solução."
+                msg_color = RED
+                input_locked = False
+            if status is not None:
+                animation = None
+
+        # ---------------- RENDER ---------------- #
+        # Só as regiões cujo estado mudou são redesenhadas e enviadas à tela
+        view = current_view()
+        if full_redraw or game_phase != drawn_phase:
+            if game_phase == "menu":
+                draw_menu(window)
+            else:
+                draw_play(window)
+            pg.display.flip()
+        else:
+            dirty = render.dirty_rects(prev_view, view)
+            if dirty:
+                if game_phase == "menu":
+                    draw_menu(window)
+                else:
+                    for rect in dirty:
+                        draw_play(window, rect)
+                pg.display.update(dirty)
+        prev_view, drawn_phase, full_redraw = view, game_phase, False
+
+        clock.tick(FPS)
+
+    if solve_job:
+        solve_job.cancel()
+    cache.save()
+    if store: store.close()
+    pg.quit()
\ No newline at end of file
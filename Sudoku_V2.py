@@ -1,11 +1,23 @@
+import math, os
 import pygame as pg
-import random, copy, time as time   # random → embaralhar; copy → clone profundo; time → medir solução
+import sudoku_core as core           # modelo, verificação, solvers e gerador (sem pygame)
+from sudoku_core import EMPTY, new_board, ConflictTracker, generate_puzzle, SIZE_OPTIONS
+from sudoku_pool import PuzzlePool    # puzzles pré-gerados em processos de fundo
+from sudoku_jobs import SolveJob, PORTFOLIO  # Solve/Check num processo separado (variantes em paralelo)
+from sudoku_cache import SolutionCache # soluções já encontradas (forma canônica, LRU)
+from sudoku_store import open_store    # puzzles pré-gerados em arquivo binário (mmap)
+import sudoku_render as render        # textos e grade pré-renderizados
 
 # =============================================================
 #                    CONFIGURAÇÕES INICIAIS
 # =============================================================
 WINDOW_SIZE = (1000, 700)           # largura, altura da janela
 FPS         = 60                    # quadros por segundo
+SOLVE_TIMEOUT = 30.0                # segundos até o Solve/Check desistir
+ANIM_SLICE  = 0.004                 # segundos de busca por quadro na animação (tecla A), para não perder quadros
+CACHE_FILE  = os.path.expanduser("~/.sudoku_solucoes.json")  # cache de soluções entre execuções
+STORE_FILE  = os.path.expanduser("~/.sudoku_puzzles.sdk")    # gerado por sudoku_store.py build (opcional)
+WINS_FILE   = os.path.expanduser("~/.sudoku_portfolio.jsonl")  # estratégia vencedora de cada Solve
 
 # Paleta de cores (RGB)
 WHITE = (245, 245, 245); BLACK = (30, 30, 30)
@@ -14,13 +26,11 @@ GREEN = (0, 160, 100);  L_GREEN  = (0, 200, 130)
 SKY   = (220, 230, 250); BLUE    = (80, 130, 255)
 RED   = (200,  60,  60)
 
-EMPTY = "n"                          # sentinela para célula vazia
-
 # -------------------------------------------------------------
 #  TAMANHO DINÂMICO DO TABULEIRO
 # -------------------------------------------------------------
-SIZE_OPTIONS = [3, 6, 9, 12, 15, 18] # múltiplos de 3
-size_idx     = 0                     # posição inicial na lista
+size_idx = 0                         # posição inicial em SIZE_OPTIONS
+NOTE_SURFS = {}                      # (x, y) → (candidatos, mini-grade renderizada) das anotações
 
 def configure(sz: int):
     """
@@ -29,11 +39,11 @@ def configure(sz: int):
     """
     global SIZE, BOX_ROWS, BOX_COLS
     global CELL_SIZE, GRID_SIZE, BOARD_TOPLEFT
-    global BIG, SMALL
+    global BIG, SMALL, GRID_SURF, GLYPHS, GLYPHS_BAD
+    global NOTE_COLS, NOTE_ROWS, NOTE_GLYPHS
 
-    SIZE       = sz
-    BOX_ROWS   = 3                   # fixo: 3 linhas por bloco
-    BOX_COLS   = SIZE // BOX_ROWS    # colunas variam (ex.: 4, 5, 6…)
+    core.configure(sz)               # fixo: 3 linhas por bloco; colunas variam (ex.: 4, 5, 6…)
+    SIZE, BOX_ROWS, BOX_COLS = core.SIZE, core.BOX_ROWS, core.BOX_COLS
 
     # calcula tamanho da célula para caber na janela, com margem lateral para botões
     CELL_SIZE  = min((WINDOW_SIZE[0] - 300) // SIZE,
@@ -45,159 +55,91 @@ def configure(sz: int):
     BIG   = pg.font.SysFont("Segoe UI", max(18, int(CELL_SIZE * 0.8)), bold=True)
     SMALL = pg.font.SysFont("Segoe UI", 28)
 
-# -------------------------------------------------------------
-#  PYGAME E FONTES FIXAS
-# -------------------------------------------------------------
-pg.init(); pg.font.init()
-TITLE_FONT     = pg.font.SysFont("Segoe UI", 48, bold=True)  # usada no menu
-configure(SIZE_OPTIONS[size_idx])                            # gera fontes BIG/SMALL vinculadas ao CELL_SIZE
-
-solve_attempts = 0        # contador global de tentativas do backtracking
-
-# =============================================================
-#                     FUNÇÕES DE LÓGICA
-# =============================================================
-def new_board():
-    """Cria tabuleiro vazio SIZE × SIZE."""
-    return [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
-
-# Acessos rápidos
-def row(b, y): return b[y]
-def col(b, x): return [b[i][x] for i in range(SIZE)]
-
-def block(b, x, y):
-    """Retorna todas as células do bloco onde (x, y) está."""
-    bx = (x // BOX_COLS) * BOX_COLS
-    by = (y // BOX_ROWS) * BOX_ROWS
-    return [b[j][i] for j in range(by, by + BOX_ROWS)
-                       for i in range(bx, bx + BOX_COLS)]
-
-def valid_number(b, x, y, n):
-    """Checa se n é válido na posição (x, y)."""
-    return n not in row(b, y) and n not in col(b, x) and n not in block(b, x, y)
-
-def is_board_consistent(b):
-    """Verifica se não há repetições – usado para entrada manual."""
-    # linhas
-    for y in range(SIZE):
-        vals = [v for v in b[y] if v != EMPTY]
-        if len(vals) != len(set(vals)): return False
-    # colunas
-    for x in range(SIZE):
-        vals = [b[y][x] for y in range(SIZE) if b[y][x] != EMPTY]
-        if len(vals) != len(set(vals)): return False
-    # blocos
-    for by in range(0, SIZE, BOX_ROWS):
-        for bx in range(0, SIZE, BOX_COLS):
-            vals = [b[yy][xx] for yy in range(by, by + BOX_ROWS)
-                               for xx in range(bx, bx + BOX_COLS)
-                               if b[yy][xx] != EMPTY]
-            if len(vals) != len(set(vals)): return False
-    return True
-
-def solve_backtracking(b, randomize=False):
-    """
-    Resolve recursivamente com backtracking.
-    Se randomize=True, embaralha a ordem de tentativas (útil para gerar puzzles).
-    """
-    global solve_attempts
-    for y in range(SIZE):
-        for x in range(SIZE):
-            if b[y][x] == EMPTY:
-                nums = list(range(1, SIZE + 1))
-                if randomize: random.shuffle(nums)
-                for n in nums:
-                    if valid_number(b, x, y, n):
-                        solve_attempts += 1
-                        b[y][x] = n
-                        if solve_backtracking(b, randomize): return True
-                        b[y][x] = EMPTY
-                return False
-    return True  # tabuleiro completo
-
-def generate_puzzle(clue_ratio=0.45):
-    """
-    1) Gera tabuleiro completamente preenchido
-    2) Remove células até restar clue_ratio de pistas
-    """
-    global solve_attempts
-    solve_attempts = 0            # zera contador para estatísticas
-    full = new_board()
-    solve_backtracking(full, randomize=True)
-
-    puzzle = copy.deepcopy(full)
-    total    = SIZE * SIZE
-    clues    = int(total * clue_ratio)
-    to_blank = total - clues
-
-    cells = list(range(total)); random.shuffle(cells)
-    for _ in range(to_blank):
-        y, x = divmod(cells.pop(), SIZE)
-        puzzle[y][x] = EMPTY
-    return puzzle
+    # caches de renderização: refeitos só aqui, quando a geometria muda
+    render.clear()
+    GRID_SURF  = render.grid_surface(WINDOW_SIZE, BOARD_TOPLEFT, SIZE, CELL_SIZE,
+                                     BOX_ROWS, BOX_COLS, WHITE, GRAY, DARKGRAY)
+    GLYPHS     = render.glyph_atlas(BIG, SIZE, BLACK)
+    GLYPHS_BAD = render.glyph_atlas(BIG, SIZE, RED)    # dígitos repetidos na linha/coluna/bloco
+
+    # anotações: mini-grade NOTE_COLS × NOTE_ROWS com os mesmos números do tabuleiro
+    # ("10", "11" …), numa fonte em que o mais largo cabe na sua coluna
+    NOTE_COLS = math.ceil(math.sqrt(SIZE)); NOTE_ROWS = math.ceil(SIZE / NOTE_COLS)
+    note_size = max(6, int(CELL_SIZE / NOTE_ROWS * 0.9))
+    note_font = pg.font.SysFont("Segoe UI", note_size)
+    while note_size > 6 and note_font.size(str(SIZE))[0] > CELL_SIZE / NOTE_COLS:
+        note_size -= 1; note_font = pg.font.SysFont("Segoe UI", note_size)
+    NOTE_GLYPHS = render.glyph_atlas(note_font, SIZE, DARKGRAY)
+    NOTE_SURFS.clear()
 
 # =============================================================
 #                        FUNÇÕES DE UI
 # =============================================================
 def draw_board(surf):
-    """Desenha grade e linhas grossas/finas."""
+    """Desenha o fundo com a grade (linhas grossas/finas) já pronta em GRID_SURF."""
+    surf.blit(GRID_SURF, (0, 0))
+
+def cell_rect(x, y):
+    """Retângulo da célula (x, y) na tela."""
     bx, by = BOARD_TOPLEFT
-    surf.fill(WHITE)
-    pg.draw.rect(surf, DARKGRAY, (bx, by, GRID_SIZE, GRID_SIZE), 4)
-
-    for i in range(1, SIZE):
-        # horizontais
-        y = by + i * CELL_SIZE
-        pg.draw.line(surf,
-                     DARKGRAY if i % BOX_ROWS == 0 else GRAY,
-                     (bx, y), (bx + GRID_SIZE, y),
-                     4 if i % BOX_ROWS == 0 else 1)
-        # verticais
-        x = bx + i * CELL_SIZE
-        pg.draw.line(surf,
-                     DARKGRAY if i % BOX_COLS == 0 else GRAY,
-                     (x, by), (x, by + GRID_SIZE),
-                     4 if i % BOX_COLS == 0 else 1)
-
-def draw_numbers(surf, b):
-    """Renderiza todos os números já presentes no tabuleiro."""
+    return pg.Rect(bx + x * CELL_SIZE, by + y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+def cells_in(area=None):
+    """Células cujo retângulo encosta em area (None = todas)."""
+    if area is None:
+        return [(x, y) for y in range(SIZE) for x in range(SIZE)]
+    bx, by = BOARD_TOPLEFT
+    x0, x1 = max(0, (area.left - bx) // CELL_SIZE), min(SIZE - 1, (area.right  - 1 - bx) // CELL_SIZE)
+    y0, y1 = max(0, (area.top  - by) // CELL_SIZE), min(SIZE - 1, (area.bottom - 1 - by) // CELL_SIZE)
+    return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+def hovered_cell():
+    """Célula sob o mouse, ou None."""
+    mx, my = pg.mouse.get_pos()
     bx, by = BOARD_TOPLEFT
-    for y in range(SIZE):
-        for x in range(SIZE):
-            v = b[y][x]
-            if v != EMPTY:
-                img = BIG.render(str(v), True, BLACK)
-                surf.blit(img, img.get_rect(center=(bx + x * CELL_SIZE + CELL_SIZE // 2,
-                                                    by + y * CELL_SIZE + CELL_SIZE // 2)))
+    if bx <= mx < bx + GRID_SIZE and by <= my < by + GRID_SIZE:
+        return ((mx - bx) // CELL_SIZE, (my - by) // CELL_SIZE)
+    return None
+
+def draw_numbers(surf, conflicts, area=None, notes=False):
+    """
+    Renderiza os números do tabuleiro de conflicts (só os que caem em area, se informada);
+    os que se repetem na linha, coluna ou bloco saem em vermelho. Com notes, as células
+    vazias mostram seus candidatos (mini-grade refeita só quando eles mudam).
+    """
+    b = conflicts.board
+    for x, y in cells_in(area):
+        v = b[y][x]
+        if v != EMPTY:
+            img = (GLYPHS_BAD if conflicts.conflicting(x, y) else GLYPHS)[v]
+            surf.blit(img, img.get_rect(center=cell_rect(x, y).center))
+        elif notes:
+            mask = conflicts.candidates(x, y)
+            if not mask: continue
+            cached = NOTE_SURFS.get((x, y))
+            if cached is None or cached[0] != mask:
+                cached = NOTE_SURFS[(x, y)] = mask, render.note_surface(NOTE_GLYPHS, mask, CELL_SIZE,
+                                                                         NOTE_COLS, NOTE_ROWS)
+            surf.blit(cached[1], cell_rect(x, y))
 
 def highlight_cell(surf, x, y, color):
     """Destaca uma célula (hover ou seleção)."""
-    bx, by = BOARD_TOPLEFT
-    pg.draw.rect(surf, color,
-                 (bx + x * CELL_SIZE, by + y * CELL_SIZE, CELL_SIZE, CELL_SIZE),
-                 border_radius=4)
+    pg.draw.rect(surf, color, cell_rect(x, y), border_radius=4)
 
 # ------ elementos genéricos ------
 def draw_button(surf, rect, text):
     hovered = rect.collidepoint(pg.mouse.get_pos())
     pg.draw.rect(surf, L_GREEN if hovered else GREEN, rect, border_radius=12)
-    lbl = SMALL.render(text, True, WHITE)
+    lbl = render.label(SMALL, text, WHITE)
     surf.blit(lbl, (rect.x + (rect.width  - lbl.get_width())  // 2,
                     rect.y + (rect.height - lbl.get_height()) // 2))
 
 def draw_message(surf, message, color):
     """Mostra mensagem (resolvido, erro, etc.) quebrando linhas se necessário."""
     if not message: return
-    words, lines, cur = message.split(), [], ""
-    for w in words:
-        test = f"{cur} {w}".strip()
-        if SMALL.size(test)[0] < 260: cur = test
-        else: lines.append(cur); cur = w
-    lines.append(cur)
-
-    x, y0 = 700, 340  # início mais abaixo para não colidir com botões
-    for i, line in enumerate(lines):
-        surf.blit(SMALL.render(line, True, color), (x, y0 + i * 30))
+    x, y0 = MESSAGE_RECT.topleft  # início mais abaixo para não colidir com botões
+    for i, line in enumerate(render.wrap(SMALL, message, 260)):
+        surf.blit(render.label(SMALL, line, color), (x, y0 + i * 30))
 
 # ------------------------ BOTÕES / RETÂNGULOS -------------------------
 MENU_RANDOM_RECT  = pg.Rect(300, 200, 400, 80)
@@ -205,12 +147,16 @@ MENU_CUSTOM_RECT  = pg.Rect(300, 300, 400, 80)
 SIZE_LEFT_RECT    = pg.Rect(220, 420, 80, 80)
 SIZE_RIGHT_RECT   = pg.Rect(700, 420, 80, 80)
 SIZE_DISPLAY_RECT = pg.Rect(320, 420, 360, 80)
+SOLVE_RECT        = pg.Rect(700, 50, 250, 80)
+CLEAR_RECT        = pg.Rect(700, 150, 250, 80)   # vira "Cancelar" durante o solve
 BACK_RECT         = pg.Rect(700, 250, 250, 80)   # botão voltar
+MESSAGE_RECT      = pg.Rect(700, 340, 300, 360)  # área de draw_message
+MENU_BUTTONS      = (MENU_RANDOM_RECT, MENU_CUSTOM_RECT, SIZE_LEFT_RECT, SIZE_RIGHT_RECT)
 
 def draw_menu(surf, size_selected):
     """Tela de menu principal."""
     surf.fill(WHITE)
-    t = TITLE_FONT.render("Escolha o modo", True, BLACK)
+    t = render.label(TITLE_FONT, "Escolha o modo", BLACK)
     surf.blit(t, ((WINDOW_SIZE[0]-t.get_width()) // 2, 80))
 
     # botões de modo
@@ -221,112 +167,264 @@ def draw_menu(surf, size_selected):
     draw_button(surf, SIZE_LEFT_RECT,  "<")
     draw_button(surf, SIZE_RIGHT_RECT, ">")
     pg.draw.rect(surf, DARKGRAY, SIZE_DISPLAY_RECT, border_radius=12)
-    lbl = SMALL.render(f"Tamanho: {size_selected}×{size_selected}", True, WHITE)
+    lbl = render.label(SMALL, f"Tamanho: {size_selected}×{size_selected}", WHITE)
     surf.blit(lbl, (SIZE_DISPLAY_RECT.x + (SIZE_DISPLAY_RECT.width - lbl.get_width()) // 2,
                     SIZE_DISPLAY_RECT.y + (SIZE_DISPLAY_RECT.height - lbl.get_height()) // 2))
 
+def draw_play(surf, conflicts, selected, buttons, message, color, area=None, notes=False):
+    """
+    Tela de jogo: grade, hover/seleção, números (conflitos em vermelho), anotações
+    (se notes), botões e mensagem. Com area, redesenha só esse recorte (quadros
+    parciais com dirty rects).
+    """
+    surf.set_clip(area)
+    if area is None: draw_board(surf)
+    else: surf.blit(GRID_SURF, area, area)
+    near  = area.inflate(2 * CELL_SIZE, 2 * CELL_SIZE) if area else None  # vizinhas podem invadir
+    hover = hovered_cell()
+    for cell, col in ((hover, SKY), (selected, BLUE)):
+        if cell and cell != (-1, -1) and (area is None or cell_rect(*cell).colliderect(near)):
+            highlight_cell(surf, *cell, col)
+    draw_numbers(surf, conflicts, near, notes)
+    for rect, text in buttons:
+        if area is None or rect.colliderect(area): draw_button(surf, rect, text)
+    if area is None or MESSAGE_RECT.colliderect(area): draw_message(surf, message, color)
+    surf.set_clip(None)
+
+# ------------------ ESTADO VISÍVEL (para dirty rects) ------------------
+def menu_view(size_selected):
+    """Estado de cada região do menu: {chave: (rect, estado)}."""
+    mouse = pg.mouse.get_pos()
+    view  = {r.topleft: (r, r.collidepoint(mouse)) for r in MENU_BUTTONS}
+    view["size"] = (SIZE_DISPLAY_RECT, size_selected)
+    return view
+
+def play_view(conflicts, selected, buttons, message, color, notes=False):
+    """Estado de cada célula, botão e da mensagem na tela de jogo: {chave: (rect, estado)}."""
+    hover, mouse, b = hovered_cell(), pg.mouse.get_pos(), conflicts.board
+    view = {(x, y): (cell_rect(x, y), (b[y][x], conflicts.conflicting(x, y),
+                                       (x, y) == hover, (x, y) == selected,
+                                       notes and conflicts.candidates(x, y)))
+            for x, y in cells_in()}
+    for rect, text in buttons:
+        view[rect.topleft] = (rect, (text, rect.collidepoint(mouse)))
+    view["msg"] = (MESSAGE_RECT, (message, color))
+    return view
+
 # =============================================================
 #                        LOOP PRINCIPAL
 # =============================================================
-window = pg.display.set_mode(WINDOW_SIZE)
-pg.display.set_caption("Sudoku – Tamanho Dinâmico")
-clock = pg.time.Clock()
-
-board        = new_board()
-input_locked = False   # bloqueia edição após resolver
-message      = ""
-msg_color    = GREEN
-selected     = (-1, -1)
-game_phase   = "menu"  # menu ▸ play
-
-running = True
-while running:
-    # -------------------- EVENTOS --------------------
-    for ev in pg.event.get():
-        if ev.type == pg.QUIT:
-            running = False
-
-        # -------- EVENTOS NO MENU --------
-        if game_phase == "menu":
-            if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
-                if SIZE_LEFT_RECT.collidepoint(ev.pos):   # tamanho --
-                    size_idx = (size_idx - 1) % len(SIZE_OPTIONS)
-                    configure(SIZE_OPTIONS[size_idx]); board = new_board()
-                elif SIZE_RIGHT_RECT.collidepoint(ev.pos):# tamanho ++
-                    size_idx = (size_idx + 1) % len(SIZE_OPTIONS)
-                    configure(SIZE_OPTIONS[size_idx]); board = new_board()
-                elif MENU_RANDOM_RECT.collidepoint(ev.pos):
-                    board = generate_puzzle(); message = ""; input_locked = False
-                    game_phase = "play"
-                elif MENU_CUSTOM_RECT.collidepoint(ev.pos):
-                    board = new_board(); message = "Insira pistas e clique Solve"
-                    msg_color = BLACK; input_locked = False; game_phase = "play"
-            continue  # volta para renderização
-
-        # -------- EVENTOS NO PLAY --------
-        if game_phase == "play":
-            if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
-                mx, my = ev.pos
-                bx, by = BOARD_TOPLEFT
-                inside = (bx <= mx <= bx + GRID_SIZE and by <= my <= by + GRID_SIZE)
-
-                # selecionar célula
-                if inside and not input_locked:
-                    selected = ((mx - bx) // CELL_SIZE, (my - by) // CELL_SIZE)
-                else:
-                    selected = (-1, -1)
-
-                # Solve / Check
-                if pg.Rect(700, 50, 250, 80).collidepoint(ev.pos):
-                    if is_board_consistent(board):
-                        temp = copy.deepcopy(board); solve_attempts = 0
-                        start = time.time()
-                        if solve_backtracking(temp):
-                            board[:] = temp
-                            message  = f"Resolvido em {time.time()-start:.3f}s ({solve_attempts} tent.)"
-                            msg_color, input_locked = GREEN, True
+if __name__ == "__main__":
+    # ---------------------------------------------------------
+    #  PYGAME E FONTES FIXAS (só ao rodar o jogo, não no import)
+    # ---------------------------------------------------------
+    pg.init(); pg.font.init()
+    TITLE_FONT = pg.font.SysFont("Segoe UI", 48, bold=True)  # usada no menu
+    configure(SIZE_OPTIONS[size_idx])                        # gera fontes BIG/SMALL vinculadas ao CELL_SIZE
+    window = pg.display.set_mode(WINDOW_SIZE)
+    pg.display.set_caption("Sudoku – Tamanho Dinâmico")
+    clock = pg.time.Clock()
+
+    pool = PuzzlePool(SIZE_OPTIONS, unique=True)            # fila de puzzles prontos por tamanho
+    pool.select(SIZE)                                        # aquece primeiro o tamanho atual
+    cache = SolutionCache(path=CACHE_FILE)                   # Solve/Check consulta antes de buscar
+    store = open_store(STORE_FILE)                           # None se não houver arquivo de puzzles
+
+    board        = new_board()
+    conflicts    = ConflictTracker(board)   # contagens por unidade, atualizadas a cada edição
+    input_locked = False   # bloqueia edição após resolver
+    message      = ""
+    msg_color    = GREEN
+    selected     = (-1, -1)
+    game_phase   = "menu"  # menu ▸ play
+    solve_job    = None    # SolveJob em andamento (Clear vira Cancelar)
+    solve_clues  = None    # pistas do solve em andamento (chave do cache)
+    animation    = None    # StepSolver animado no tabuleiro (tecla A; Clear vira Cancelar)
+    notes        = False   # anotações automáticas (candidatos) nas células vazias – tecla N
+    prev_view    = {}      # estado desenhado no último quadro (dirty rects)
+    drawn_phase  = None    # tela do último quadro; trocar de tela força quadro cheio
+    full_redraw  = True    # próximo quadro inteiro (início, troca de tela, janela exposta, animação)
+
+    running = True
+    while running:
+        # -------------------- EVENTOS --------------------
+        # ocioso: dorme até o próximo evento; com trabalho em segundo plano acorda a cada 100 ms
+        if full_redraw or animation:
+            events = pg.event.get()
+        else:
+            busy   = solve_job is not None or pool.busy()
+            events = [pg.event.wait(100) if busy else pg.event.wait()] + pg.event.get()
+
+        for ev in events:
+            if ev.type == pg.QUIT:
+                running = False
+            if ev.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                full_redraw = True
+
+            # -------- EVENTOS NO MENU --------
+            if game_phase == "menu":
+                if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
+                    if SIZE_LEFT_RECT.collidepoint(ev.pos):   # tamanho --
+                        size_idx = (size_idx - 1) % len(SIZE_OPTIONS)
+                        configure(SIZE_OPTIONS[size_idx]); board = new_board(); pool.select(SIZE)
+                        conflicts = ConflictTracker(board)
+                    elif SIZE_RIGHT_RECT.collidepoint(ev.pos):# tamanho ++
+                        size_idx = (size_idx + 1) % len(SIZE_OPTIONS)
+                        configure(SIZE_OPTIONS[size_idx]); board = new_board(); pool.select(SIZE)
+                        conflicts = ConflictTracker(board)
+                    elif MENU_RANDOM_RECT.collidepoint(ev.pos):
+                        # do arquivo de puzzles ou pronto na fila; só gera na hora se ambos faltarem
+                        stored = store and store.random(SIZE)
+                        board  = core.from_flat(stored) if stored else (pool.take(SIZE) or generate_puzzle(unique=True))
+                        conflicts = ConflictTracker(board)
+                        message = ""; input_locked = False
+                        game_phase = "play"
+                    elif MENU_CUSTOM_RECT.collidepoint(ev.pos):
+                        board = new_board(); message = "Insira pistas e clique Solve (A anima, N anota)"
+                        conflicts = ConflictTracker(board)
+                        msg_color = BLACK; input_locked = False; game_phase = "play"
+                continue  # volta para renderização
+
+            # -------- EVENTOS NO PLAY --------
+            if game_phase == "play":
+                if ev.type == pg.MOUSEBUTTONDOWN and ev.button == 1:
+                    mx, my = ev.pos
+                    bx, by = BOARD_TOPLEFT
+                    inside = (bx <= mx <= bx + GRID_SIZE and by <= my <= by + GRID_SIZE)
+
+                    # selecionar célula
+                    if inside and not input_locked:
+                        selected = ((mx - bx) // CELL_SIZE, (my - by) // CELL_SIZE)
+                    else:
+                        selected = (-1, -1)
+
+                    # Solve / Check (roda em outro processo; o resultado chega no poll abaixo)
+                    if SOLVE_RECT.collidepoint(ev.pos) and not (solve_job or animation):
+                        hit = cache.get(board) if conflicts.consistent() else None
+                        if hit:
+                            board[:] = core.from_flat(hit); conflicts = ConflictTracker(board)
+                            message, msg_color = "Resolvido (solução em cache).", GREEN
+                            selected, input_locked = (-1, -1), True
+                        elif conflicts.consistent():
+                            solve_clues = core.to_flat(board)
+                            solve_job = SolveJob(board, timeout=SOLVE_TIMEOUT, strategies=PORTFOLIO, log=WINS_FILE)
+                            message, msg_color = "Resolvendo…", BLACK
+                            selected, input_locked = (-1, -1), True
                         else:
-                            message, msg_color = "Sem solução.", RED
+                            message, msg_color = "Conflitos nas pistas!", RED
+
+                    # Clear / Cancelar
+                    if CLEAR_RECT.collidepoint(ev.pos):
+                        if solve_job: solve_job.cancel()
+                        elif animation:
+                            core.copy_into(board, solve_clues); animation = None
+                            message, msg_color, input_locked = "Animação cancelada.", RED, False
+                        else:
+                            board = new_board(); message = ""; input_locked = False
+                            conflicts = ConflictTracker(board)
+
+                    # Voltar ao menu
+                    if BACK_RECT.collidepoint(ev.pos):
+                        if solve_job: solve_job.cancel(); solve_job = None
+                        animation = None
+                        game_phase = "menu"; selected = (-1, -1); message = ""; input_locked = False
+
+                # N: liga/desliga as anotações (todas as células mudam: quadro cheio)
+                if ev.type == pg.KEYDOWN and ev.key == pg.K_n:
+                    notes = not notes; full_redraw = True
+
+                # A: resolve animando a busca no tabuleiro, uma fatia por quadro
+                if (ev.type == pg.KEYDOWN and ev.key == pg.K_a and not input_locked
+                        and not (solve_job or animation)):
+                    if conflicts.consistent():
+                        solve_clues = core.to_flat(board)
+                        animation = core.StepSolver(core.to_flat(board), mrv=True)
+                        selected, input_locked = (-1, -1), True
                     else:
                         message, msg_color = "Conflitos nas pistas!", RED
 
-                # Clear
-                if pg.Rect(700, 150, 250, 80).collidepoint(ev.pos):
-                    board = new_board(); message = ""; input_locked = False
-
-                # Voltar ao menu
-                if BACK_RECT.collidepoint(ev.pos):
-                    game_phase = "menu"; selected = (-1, -1); message = ""; input_locked = False
-
-            # entrada de números / backspace / espaço
-            if ev.type == pg.KEYDOWN and selected != (-1, -1) and not input_locked:
-                k = pg.key.name(ev.key); sx, sy = selected
-                if k.isdigit() and k != "0":
-                    n = int(k)
-                    if 1 <= n <= SIZE: board[sy][sx] = n
-                elif ev.key in (pg.K_BACKSPACE, pg.K_SPACE):
-                    board[sy][sx] = EMPTY
-
-    # -------------------- DRAW --------------------
-    if game_phase == "menu":
-        draw_menu(window, SIZE)
-    else:
-        draw_board(window)
-        # hover + seleção
-        mx, my = pg.mouse.get_pos()
-        bx, by = BOARD_TOPLEFT
-        if bx <= mx <= bx + GRID_SIZE and by <= my <= by + GRID_SIZE:
-            highlight_cell(window, (mx - bx) // CELL_SIZE, (my - by) // CELL_SIZE, SKY)
-        if selected != (-1, -1):
-            highlight_cell(window, *selected, BLUE)
-
-        draw_numbers(window, board)
-        draw_button(window, pg.Rect(700, 50, 250, 80),  "Solve / Check")
-        draw_button(window, pg.Rect(700, 150, 250, 80), "Clear Board")
-        draw_button(window, BACK_RECT, "Voltar ao Menu")
-        draw_message(window, message, msg_color)
-
-    pg.display.flip()
-    clock.tick(FPS)
-
-pg.quit()
\ No newline at end of file
+                # entrada de números / backspace / espaço
+                if ev.type == pg.KEYDOWN and selected != (-1, -1) and not input_locked:
+                    k = pg.key.name(ev.key); sx, sy = selected
+                    if k.isdigit() and k != "0":
+                        n = int(k)
+                        if 1 <= n <= SIZE: conflicts.set(sx, sy, n)
+                    elif ev.key in (pg.K_BACKSPACE, pg.K_SPACE):
+                        conflicts.set(sx, sy, EMPTY)
+
+        # -------------------- SOLVE EM ANDAMENTO --------------------
+        if solve_job:
+            status = solve_job.poll()
+            if status is None:
+                message = (f"Resolvendo… {solve_job.attempts} tent., "
+                           f"prof. {solve_job.depth} ({solve_job.elapsed:.1f}s)")
+            elif status == "solved":
+                board[:] = solve_job.solution
+                conflicts = ConflictTracker(board)
+                cache.put(solve_clues, board)
+                message  = (f"Resolvido em {solve_job.elapsed:.3f}s por {solve_job.winner} "
+                            f"({solve_job.attempts} tent., {solve_job.backtracks} retr.)")
+                msg_color = GREEN
+            else:
+                message = {"unsolvable": "Sem solução.",
+                           "timeout":    f"Tempo esgotado ({SOLVE_TIMEOUT:.0f}s).",
+                           "cancelled":  "Busca cancelada.",
+                           "error":      f"Erro no solver (código {solve_job.exitcode})."}[status]
+                msg_color, input_locked = RED, False
+            if status: solve_job = None
+
+        # -------------------- ANIMAÇÃO --------------------
+        # a busca avança uma fatia por quadro; só as células que mudaram são redesenhadas
+        if animation:
+            status = animation.run(budget=ANIM_SLICE)
+            if status is False:
+                core.copy_into(board, solve_clues)
+                message, msg_color, input_locked = "Sem solução.", RED, False
+            else:
+                core.copy_into(board, animation.board)
+            if status is None:
+                message, msg_color = (f"Animando… {animation.steps} passos, "
+                                      f"prof. {len(animation.stack)}"), BLACK
+            elif status:
+                conflicts = ConflictTracker(board)
+                cache.put(solve_clues, board)
+                message  = (f"Resolvido em {animation.steps} passos "
+                            f"({animation.stats.backtracks} retr.)")
+                msg_color = GREEN
+            if status is not None: animation = None
+
+        # -------------------- DRAW --------------------
+        # só as regiões cujo estado mudou são redesenhadas e enviadas à tela
+        if game_phase == "menu":
+            view = menu_view(SIZE)
+        else:
+            buttons = [(SOLVE_RECT, "Solve / Check"),
+                       (CLEAR_RECT, "Cancelar" if solve_job or animation else "Clear Board"),
+                       (BACK_RECT,  "Voltar ao Menu")]
+            # a animação escreve direto no tabuleiro, sem passar pelo ConflictTracker:
+            # os candidatos ficariam velhos, então as anotações somem enquanto ela roda
+            show_notes = notes and not animation
+            view = play_view(conflicts, selected, buttons, message, msg_color, show_notes)
+
+        if full_redraw or game_phase != drawn_phase:
+            if game_phase == "menu": draw_menu(window, SIZE)
+            else: draw_play(window, conflicts, selected, buttons, message, msg_color, notes=show_notes)
+            pg.display.flip()
+        else:
+            dirty = render.dirty_rects(prev_view, view)
+            if dirty:
+                if game_phase == "menu": draw_menu(window, SIZE)
+                else:
+                    for rect in dirty:
+                        draw_play(window, conflicts, selected, buttons, message, msg_color, rect, show_notes)
+                pg.display.update(dirty)
+        prev_view, drawn_phase, full_redraw = view, game_phase, False
+
+        pool.refill()          # recolhe/agenda pré-gerações sem bloquear
+        clock.tick(FPS)
+
+    if solve_job: solve_job.cancel()
+    pool.close()
+    cache.save()
+    if store: store.close()
+    pg.quit()
\ No newline at end of file
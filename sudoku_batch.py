@@ -0,0 +1,175 @@
+"""
+Resolução em lote pela linha de comando.
+
+Lê puzzles em fluxo (arquivo ou stdin), um por linha no formato SIZE² caracteres
+("." ou "0" = vazio; dígitos acima de 9 como A, B, C…), distribui em blocos por um
+pool de processos e escreve as soluções na mesma ordem da entrada, conforme ficam prontas.
+Puzzles inválidos ou sem solução geram uma linha vazia na saída.
+Com --cache, puzzles já resolvidos (ou equivalentes) saem do cache de soluções
+sem ir para o pool, e as soluções novas são gravadas nele ao final.
+Com --vector (requer NumPy), cada bloco passa primeiro pela propagação vetorizada
+de sudoku_vec e só os puzzles que ela não fecha vão para o solver escalar.
+
+    python sudoku_batch.py puzzles.txt -o solucoes.txt -w 8 -c 64
+    cat puzzles.txt | python sudoku_batch.py -e mrv --cache solucoes.json
+    python sudoku_batch.py puzzles.txt --vector -c 1024
+    python sudoku_batch.py --store puzzles.sdk -s 12 -n 5000
+"""
+import argparse, collections, itertools, multiprocessing as mp, sys, time
+
+import sudoku_core as core
+from sudoku_cache import SolutionCache, CACHE_SIZE
+from sudoku_store import PuzzleStore
+
+def parse_line(line):
+    """Ajusta a geometria ao tamanho da linha e devolve o tabuleiro plano (ValueError se inválida)."""
+    sz = core.puzzle_size(line)
+    if sz != core.SIZE: core.configure(sz)
+    return core.parse_puzzle(line, flat=True)
+
+def solve_line(line, engine):
+    """Resolve um puzzle em texto; devolve (solução ou "", tentativas)."""
+    try:
+        b = parse_line(line)
+    except ValueError:
+        return "", 0
+    stats = core.SolveStats()
+    if not core.is_board_consistent(b) or not core.SOLVERS[engine](b, stats=stats):
+        return "", stats.nodes
+    return core.format_board(b), stats.nodes
+
+def solve_chunk(lines, engine, vector=False):
+    """Tarefa de um worker: resolve um bloco de linhas."""
+    if vector: return solve_chunk_vector(lines, engine)
+    return [solve_line(line, engine) for line in lines]
+
+def solve_chunk_vector(lines, engine):
+    """
+    Como solve_chunk, mas resolve as linhas de cada tamanho como um lote de sudoku_vec.
+    As tentativas do solver escalar são do lote todo e vão na primeira linha dele.
+    """
+    import sudoku_vec                   # NumPy só é exigido por este caminho
+    results = [("", 0)] * len(lines)
+    groups  = collections.defaultdict(list)
+    for i, line in enumerate(lines):
+        try:
+            groups[core.puzzle_size(line)].append(i)
+        except ValueError:
+            pass
+    for size, idx in groups.items():
+        core.configure(size)
+        valid = []
+        for i in idx:
+            try:
+                valid.append((i, core.parse_puzzle(lines[i], flat=True)))
+            except ValueError:
+                pass
+        if not valid: continue
+        stats = core.SolveStats()
+        sol, ok = sudoku_vec.solve_batch(sudoku_vec.from_boards([b for _, b in valid]), engine, stats)
+        for k, (i, _) in enumerate(valid):
+            results[i] = (core.format_board(sol[k].tobytes()) if ok[k] else "", 0)
+        i = valid[0][0]
+        results[i] = (results[i][0], stats.nodes)
+    return results
+
+def read_puzzles(stream):
+    """Gera as linhas não vazias da entrada sem carregar o arquivo inteiro."""
+    for line in stream:
+        line = line.strip()
+        if line: yield line
+
+def store_lines(path, size, band=None, count=1):
+    """count puzzles sorteados do arquivo binário path (sudoku_store), como linhas de texto."""
+    with PuzzleStore(path) as store:
+        core.configure(size)
+        for _ in range(count):
+            f = store.random(size, band)
+            if f is None: return
+            yield core.format_board(f)
+
+def cached(cache, line):
+    """Solução em texto de line se ela (ou uma equivalente) está no cache; senão None."""
+    try:
+        sol = cache.get(parse_line(line))
+    except ValueError:
+        return None
+    return core.format_board(sol) if sol else None
+
+def run(stream, out, workers=None, chunksize=64, engine=None, cache=None, vector=False):
+    """
+    Resolve todos os puzzles de stream e escreve em out, mantendo a ordem.
+    No máximo 2 × workers blocos ficam em voo, então a memória não cresce com a entrada.
+    Com cache (SolutionCache), só os puzzles ausentes dele vão para o pool, e as
+    soluções que voltam são guardadas. Com vector, os blocos vão por solve_chunk_vector.
+    Retorna (puzzles, sem solução, tentativas totais).
+    """
+    engine  = engine or core.SOLVE_ENGINE
+    workers = workers or mp.cpu_count()
+    puzzles = unsolved = attempts = 0
+    pending = collections.deque()
+    lines   = read_puzzles(stream)
+
+    def drain(chunk, known, job):
+        nonlocal puzzles, unsolved, attempts
+        solved = iter(job.get())
+        for line, hit in zip(chunk, known):
+            solution, tries = (hit, 0) if hit else next(solved)
+            if cache is not None and solution and not hit:
+                cache.put(parse_line(line), parse_line(solution))
+            out.write(solution + "\n")
+            puzzles  += 1; attempts += tries
+            unsolved += not solution
+
+    with mp.Pool(workers) as pool:
+        while True:
+            chunk = list(itertools.islice(lines, chunksize))
+            if not chunk: break
+            known = [cached(cache, line) for line in chunk] if cache is not None else [None] * len(chunk)
+            todo  = [line for line, hit in zip(chunk, known) if not hit]
+            pending.append((chunk, known, pool.apply_async(solve_chunk, (todo, engine, vector))))
+            if len(pending) >= 2 * workers:
+                drain(*pending.popleft())
+        while pending:
+            drain(*pending.popleft())
+    return puzzles, unsolved, attempts
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Resolve puzzles de Sudoku em lote (um por linha).")
+    ap.add_argument("input", nargs="?", default="-", help="arquivo de entrada (padrão: stdin)")
+    ap.add_argument("-o", "--output", default="-", help="arquivo de saída (padrão: stdout)")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="processos no pool (padrão: nº de CPUs)")
+    ap.add_argument("-c", "--chunksize", type=int, default=64, help="puzzles por tarefa enviada a um worker")
+    ap.add_argument("-e", "--engine", choices=sorted(core.SOLVERS), default=core.SOLVE_ENGINE,
+                    help="motor de resolução")
+    ap.add_argument("--cache", metavar="ARQUIVO", help="cache de soluções em JSON (lido e regravado)")
+    ap.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="entradas mantidas no cache")
+    ap.add_argument("--vector", action="store_true",
+                    help="propagação vetorizada (NumPy) por bloco antes do solver escalar")
+    ap.add_argument("--store", metavar="ARQUIVO", help="sortear a entrada de um arquivo de puzzles (sudoku_store)")
+    ap.add_argument("-s", "--size", type=int, default=9, help="tamanho sorteado com --store")
+    ap.add_argument("-b", "--band", default=None, help="faixa sorteada com --store (padrão: qualquer)")
+    ap.add_argument("-n", "--count", type=int, default=1000, help="puzzles sorteados com --store")
+    args = ap.parse_args(argv)
+
+    if args.store:
+        src = store_lines(args.store, args.size, args.band, args.count)
+    else:
+        src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    cache = SolutionCache(args.cache_size, args.cache) if args.cache else None
+    start = time.perf_counter()
+    try:
+        puzzles, unsolved, attempts = run(src, dst, args.workers, args.chunksize, args.engine, cache,
+                                          args.vector)
+        if cache is not None: cache.save()
+    finally:
+        if src is not sys.stdin:  src.close()   # arquivo ou gerador do --store
+        if dst is not sys.stdout: dst.close()
+    elapsed = time.perf_counter() - start
+    print(f"{puzzles} puzzles em {elapsed:.2f}s ({puzzles / elapsed if elapsed else 0:.1f} puzzles/s), "
+          f"{unsolved} sem solução, {attempts} tentativas"
+          + (f", {cache.hits} do cache" if cache is not None else ""), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
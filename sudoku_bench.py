@@ -0,0 +1,173 @@
+"""
+Benchmark sem interface do núcleo do Sudoku.
+
+Gera um corpus fixo (semente + tamanho + faixa de dificuldade ⇒ sempre os mesmos
+puzzles) para cada tamanho de SIZE_OPTIONS e mede os solvers, generate_puzzle e
+is_board_consistent: tempo de parede (perf_counter, melhor de --repeat rodadas),
+nós (tentativas), retrocessos e pico de memória (tracemalloc, numa rodada à parte
+com um só puzzle – o rastreio deixa tudo dezenas de vezes mais lento).
+O resultado sai em JSON; com --compare, confronta com um baseline salvo e sai
+com código 1 se houver regressão (em máquina compartilhada, aumente --tolerance).
+
+    python sudoku_bench.py -o baseline.json
+    python sudoku_bench.py --compare baseline.json -e mrv dlx -s 9 12
+"""
+import argparse, hashlib, json, platform, random, sys, time, tracemalloc
+
+import sudoku_core as core
+
+# faixa de dificuldade → fração mínima de pistas (puzzles com solução única)
+BANDS = {"facil": 0.60, "medio": 0.45, "dificil": 0.30}
+
+NODE_BUDGET      = 20000  # nós por puzzle antes de desistir (backtracking puro explode nos grandes)
+CONSISTENCY_LOOPS = 200   # chamadas de is_board_consistent por puzzle (uma só é rápida demais)
+MIN_TIME          = 0.002 # diferenças de tempo abaixo disso (s) são ruído, nunca regressão
+
+class BudgetExceeded(Exception):
+    """Levantada pelo gancho on_node quando um solve passa do orçamento de nós."""
+
+def corpus(seed, size, band, count):
+    """count puzzles planos da faixa band, sempre iguais para a mesma (seed, size, band)."""
+    core.configure(size)
+    random.seed(f"{seed}-{size}-{band}")
+    return [core.generate_puzzle(BANDS[band], unique=True, flat=True) for _ in range(count)]
+
+def measure(fn, repeat, probe):
+    """
+    Roda fn() repeat vezes e probe() uma vez sob tracemalloc;
+    devolve (melhor tempo de fn, último retorno de fn, pico de memória de probe em KiB).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out   = fn()
+        elapsed = time.perf_counter() - start
+        best  = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    probe()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, out, round(peak / 1024, 1)
+
+def bench_solver(engine, puzzles, repeat, budget):
+    """Resolve cópias de todos os puzzles; nós/retrocessos somados e quantos estouraram o orçamento."""
+    solve = core.SOLVERS[engine]
+
+    def on_node(stats, depth):
+        if stats.nodes > budget: raise BudgetExceeded
+
+    def run(puzzles=puzzles):
+        nodes = backtracks = solved = over = 0
+        for p in puzzles:
+            stats = core.SolveStats(on_node=on_node)
+            try:
+                solved += bool(solve(p[:], stats=stats))
+            except BudgetExceeded:
+                over += 1
+            nodes += stats.nodes; backtracks += stats.backtracks
+        return nodes, backtracks, solved, over
+
+    elapsed, (nodes, backtracks, solved, over), peak = measure(run, repeat, lambda: run(puzzles[:1]))
+    return {"time": elapsed, "nodes": nodes, "backtracks": backtracks,
+            "solved": solved, "over_budget": over, "peak_kib": peak}
+
+def bench_generate(seed, size, band, count, repeat):
+    """generate_puzzle com solução única na faixa band; nós = tentativas dos testes de unicidade."""
+    def run(count=count):
+        random.seed(f"gen-{seed}-{size}-{band}")
+        stats = core.SolveStats()
+        for _ in range(count):
+            core.generate_puzzle(BANDS[band], unique=True, flat=True, stats=stats)
+        return stats.nodes
+    elapsed, nodes, peak = measure(run, repeat, lambda: run(1))
+    return {"time": elapsed, "nodes": nodes, "peak_kib": peak}
+
+def bench_consistency(puzzles, repeat):
+    """is_board_consistent sobre o corpus, CONSISTENCY_LOOPS vezes por puzzle."""
+    boards = [core.from_flat(p) for p in puzzles]   # a interface chama com listas
+    def run():
+        for _ in range(CONSISTENCY_LOOPS):
+            for b in boards: core.is_board_consistent(b)
+    elapsed, _, peak = measure(run, repeat, lambda: core.is_board_consistent(boards[0]))
+    return {"time": elapsed, "calls": CONSISTENCY_LOOPS * len(boards), "peak_kib": peak}
+
+def run(sizes, bands, engines, count=5, repeat=3, seed=0, budget=NODE_BUDGET, log=None):
+    """
+    Roda o benchmark completo e devolve o dicionário do JSON:
+    {"meta": {...}, "results": {"solve/<motor>/<SIZE>/<faixa>": {...}, "generate/…", "consistency/…"}}.
+    """
+    results, digests = {}, {}
+    for size in sizes:
+        for band in bands:
+            puzzles = corpus(seed, size, band, count)
+            case = f"{size}/{band}"
+            digests[case] = hashlib.sha1("".join(map(core.format_board, puzzles)).encode()).hexdigest()
+            for engine in engines:
+                results[f"solve/{engine}/{case}"] = bench_solver(engine, puzzles, repeat, budget)
+            results[f"generate/{case}"]    = bench_generate(seed, size, band, count, repeat)
+            results[f"consistency/{case}"] = bench_consistency(puzzles, repeat)
+            if log: print(f"{case} ok", file=log)
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "seed": seed, "count": count, "repeat": repeat, "budget": budget,
+            "corpus_sha1": digests}
+    return {"meta": meta, "results": results}
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Lista as regressões de current em relação a baseline (mesmas chaves).
+    Tempo (com folga mínima MIN_TIME) e memória regridem acima de (1 + tolerance) × baseline;
+    nós são determinísticos, então qualquer aumento conta. Casos cujo corpus mudou
+    são apontados e não comparados.
+    """
+    problems = []
+    cur_corpus, base_corpus = current["meta"]["corpus_sha1"], baseline["meta"]["corpus_sha1"]
+    changed = {c for c in cur_corpus if c in base_corpus and cur_corpus[c] != base_corpus[c]}
+    for case in sorted(changed):
+        problems.append(f"{case}: corpus diferente do baseline (semente ou quantidade mudaram)")
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None or "/".join(key.split("/")[-2:]) in changed: continue
+        limits = {"time":     max(base["time"] * (1 + tolerance), base["time"] + MIN_TIME),
+                  "peak_kib": base["peak_kib"] * (1 + tolerance)}
+        for metric, limit in limits.items():
+            if cur[metric] > limit:
+                problems.append(f"{key}: {metric} {base[metric]:.4g} → {cur[metric]:.4g} "
+                                f"(+{(cur[metric] / base[metric] - 1) * 100:.0f}%)")
+        for metric in ("nodes", "over_budget"):
+            if metric in cur and cur[metric] > base.get(metric, cur[metric]):
+                problems.append(f"{key}: {metric} {base[metric]} → {cur[metric]}")
+    return problems
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark reprodutível dos solvers e do gerador.")
+    ap.add_argument("-o", "--output", default="-", help="arquivo JSON de saída (padrão: stdout)")
+    ap.add_argument("-s", "--sizes", type=int, nargs="+", default=core.SIZE_OPTIONS, help="tamanhos a medir")
+    ap.add_argument("-b", "--bands", nargs="+", choices=list(BANDS), default=list(BANDS),
+                    help="faixas de dificuldade")
+    ap.add_argument("-e", "--engines", nargs="+", choices=sorted(core.SOLVERS), default=list(core.SOLVERS),
+                    help="motores de resolução")
+    ap.add_argument("-n", "--count", type=int, default=5, help="puzzles por tamanho e faixa")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="rodadas de tempo (vale a melhor)")
+    ap.add_argument("--seed", type=int, default=0, help="semente do corpus")
+    ap.add_argument("--budget", type=int, default=NODE_BUDGET, help="nós por puzzle antes de desistir")
+    ap.add_argument("--compare", metavar="BASELINE", help="JSON salvo para detectar regressões")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="folga relativa de tempo/memória")
+    args = ap.parse_args(argv)
+
+    report = run(args.sizes, args.bands, args.engines, args.count, args.repeat,
+                 args.seed, args.budget, log=sys.stderr)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for p in problems: print("REGRESSÃO", p, file=sys.stderr)
+        print(f"{len(problems)} regressões contra {args.compare}", file=sys.stderr)
+        if problems: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
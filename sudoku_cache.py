@@ -0,0 +1,146 @@
+"""
+Cache de soluções indexado pela forma canônica das pistas.
+
+Puzzles equivalentes – dígitos trocados, linhas permutadas dentro da banda,
+colunas dentro da pilha, bandas, pilhas ou transposição (blocos quadrados) –
+caem na mesma chave, e a solução guardada volta ao puzzle pedido pela
+transformação inversa. A canonização é heurística: linhas e colunas são
+ordenadas por assinaturas invariantes (pistas por linha/coluna, refinadas
+pelas vizinhas) e empates ficam na ordem original; um empate mal resolvido
+só custa um miss, nunca uma solução errada.
+
+O cache é LRU (OrderedDict) e pode ser salvo em JSON para sobreviver a reinícios.
+"""
+import collections, json, os
+
+import sudoku_core as core
+
+CACHE_SIZE   = 4096    # entradas mantidas antes de descartar a menos usada
+REFINE_ROUND = 2       # rodadas de refinamento das assinaturas de linha/coluna
+
+def _transpose(f):
+    S = core.SIZE
+    return bytearray(f[c * S + r] for r in range(S) for c in range(S))
+
+def _ranks(sigs):
+    """Troca assinaturas (aninhadas) por inteiros que preservam a ordem."""
+    table = {s: i for i, s in enumerate(sorted(set(sigs)))}
+    return [table[s] for s in sigs]
+
+def _order(sig, group):
+    """
+    Ordem das linhas (ou colunas): grupos de group em group (bandas/pilhas)
+    ordenados pelas assinaturas dos membros, e os membros de cada grupo pela própria.
+    """
+    S = core.SIZE
+    members = lambda g: range(g * group, (g + 1) * group)
+    groups  = sorted(range(S // group), key=lambda g: (sorted(sig[i] for i in members(g)), g))
+    return [i for g in groups for i in sorted(members(g), key=lambda i: (sig[i], i))]
+
+def _relabel(g, rows, cols, labels):
+    """Percorre g na ordem (rows × cols) renumerando dígitos pela 1ª aparição; completa labels."""
+    S, out = core.SIZE, bytearray()
+    for r in rows:
+        for c in cols:
+            v = g[r * S + c]
+            if v and v not in labels: labels[v] = len(labels) + 1
+            out.append(labels[v] if v else 0)
+    return out
+
+def canonical(f):
+    """
+    Forma canônica do tabuleiro plano f na geometria atual.
+    Devolve (chave em texto, transformação) – a transformação leva f à forma canônica.
+    """
+    S, best = core.SIZE, None
+    for flip in ((False, True) if core.BOX_ROWS == core.BOX_COLS else (False,)):
+        g = _transpose(f) if flip else f
+        in_row = [[c for c in range(S) if g[r * S + c]] for r in range(S)]
+        in_col = [[r for r in range(S) if g[r * S + c]] for c in range(S)]
+        rs, cs = [len(x) for x in in_row], [len(x) for x in in_col]
+        for _ in range(REFINE_ROUND):
+            rs, cs = (_ranks([(rs[r], tuple(sorted(cs[c] for c in in_row[r]))) for r in range(S)]),
+                      _ranks([(cs[c], tuple(sorted(rs[r] for r in in_col[c]))) for c in range(S)]))
+        rows, cols = _order(rs, core.BOX_ROWS), _order(cs, core.BOX_COLS)
+        labels = {}
+        key = _relabel(g, rows, cols, labels)
+        if best is None or key < best[0]:
+            best = key, (flip, rows, cols, labels)
+    key, transform = best
+    return f"{S}x{core.BOX_ROWS}:{core.format_board(key)}", transform
+
+def to_canonical(sol, transform):
+    """Aplica transform à solução sol; dígitos sem pista ganham os rótulos seguintes."""
+    flip, rows, cols, labels = transform
+    return _relabel(_transpose(sol) if flip else sol, rows, cols, dict(labels))
+
+def from_canonical(canon, transform):
+    """Inverso de to_canonical; dígitos sem pista recebem os que sobraram (qualquer troca entre eles vale)."""
+    S = core.SIZE
+    flip, rows, cols, labels = transform
+    back  = {new: old for old, new in labels.items()}
+    spare = iter(sorted(set(range(1, S + 1)) - set(labels)))
+    g = bytearray(S * S)
+    for i, r in enumerate(rows):
+        for j, c in enumerate(cols):
+            v = canon[i * S + j]
+            if v not in back: back[v] = next(spare)
+            g[r * S + c] = back[v]
+    return _transpose(g) if flip else g
+
+class SolutionCache:
+    """
+    Soluções já encontradas, por forma canônica das pistas, com descarte LRU.
+    Com path, carrega o arquivo na criação (se existir e for válido) e save() o regrava.
+    """
+
+    def __init__(self, capacity=CACHE_SIZE, path=None):
+        self.capacity = capacity
+        self.path     = path
+        self.entries  = collections.OrderedDict()   # chave canônica → solução canônica em texto
+        self.hits = self.misses = 0
+        if path: self.load()
+
+    def get(self, b):
+        """Solução (plana) do puzzle b (listas ou plano), se ele ou um equivalente já foi resolvido."""
+        f = core.to_flat(b)
+        key, transform = canonical(f)
+        text = self.entries.get(key)
+        if text is None:
+            self.misses += 1; return None
+        try:
+            sol = from_canonical(core.parse_puzzle(text, flat=True), transform)
+        except (ValueError, StopIteration):
+            sol = bytearray(len(f))
+        if not all(sol) or any(v and v != s for v, s in zip(f, sol)) or not core.is_board_consistent(sol):
+            del self.entries[key]                    # entrada corrompida (arquivo editado?)
+            self.misses += 1; return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return sol
+
+    def put(self, b, solution):
+        """Guarda solution (listas ou plano) como a solução do puzzle b."""
+        key, transform = canonical(core.to_flat(b))
+        canon = to_canonical(core.to_flat(solution), transform)
+        self.entries[key] = core.format_board(canon)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def load(self):
+        """Lê path; arquivo ausente ou inválido deixa o cache vazio."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = collections.OrderedDict(data["entries"][-self.capacity:])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = collections.OrderedDict()
+
+    def save(self):
+        """Regrava path (escrita atômica via arquivo temporário), da menos para a mais usada."""
+        if not self.path: return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": list(self.entries.items())}, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,784 @@
+"""
+Núcleo do Sudoku sem pygame: modelo do tabuleiro, verificação, solvers e gerador.
+
+Usado por Sudoku_V1.py e Sudoku_V2.py e importável em servidores sem display.
+A geometria (SIZE, BOX_ROWS, BOX_COLS) é global do módulo e muda via configure().
+"""
+import random, time   # random → embaralhar; time → estatísticas de resolução
+
+EMPTY = "n"                          # sentinela para célula vazia
+
+def configure(sz: int, box_rows: int = 3):
+    """Ajusta a geometria global: tabuleiro SZ × SZ com blocos box_rows × (SZ // box_rows)."""
+    global SIZE, BOX_ROWS, BOX_COLS
+    SIZE     = sz
+    BOX_ROWS = box_rows
+    BOX_COLS = SIZE // BOX_ROWS
+
+configure(9)                         # padrão clássico 9 × 9 com blocos 3 × 3
+SIZE_OPTIONS = [3, 6, 9, 12, 15, 18]  # tamanhos oferecidos pela interface (múltiplos de 3)
+
+class SolveStats:
+    """
+    Estatísticas de uma resolução – um objeto por solve, nada global, então
+    buscas simultâneas (threads, processos, geração) não se misturam:
+      • nodes          – tentativas (dígito colocado por ramificação);
+      • backtracks     – tentativas desfeitas;
+      • eliminations   – candidatos cortados pela propagação (só MRV propaga);
+      • max_depth      – maior profundidade de busca alcançada;
+      • solutions      – soluções encontradas;
+      • first_solution – segundos desde a criação até a 1ª solução (None se nenhuma);
+      • phases         – fase → segundos acumulados ("setup", "search", "propagate", …).
+    Ganchos opcionais on_node(stats, depth), on_backtrack(stats, depth) e on_solution(stats)
+    servem para amostrar a busca, perfilar ou publicar progresso sem mexer nos solvers;
+    podem levantar exceção para abortar a busca.
+    """
+
+    def __init__(self, on_node=None, on_backtrack=None, on_solution=None):
+        self.nodes = self.backtracks = self.eliminations = self.max_depth = self.solutions = 0
+        self.first_solution = None
+        self.phases  = {}
+        self.started = time.perf_counter()
+        self.on_node, self.on_backtrack, self.on_solution = on_node, on_backtrack, on_solution
+
+    def node(self, depth):
+        self.nodes += 1
+        if depth > self.max_depth: self.max_depth = depth
+        if self.on_node: self.on_node(self, depth)
+
+    def backtrack(self, depth):
+        self.backtracks += 1
+        if self.on_backtrack: self.on_backtrack(self, depth)
+
+    def solution(self):
+        self.solutions += 1
+        if self.first_solution is None: self.first_solution = time.perf_counter() - self.started
+        if self.on_solution: self.on_solution(self)
+
+    def timed(self, phase, start):
+        """Soma à fase phase o tempo decorrido desde start (um time.perf_counter())."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def summary(self):
+        """Só os números (sem ganchos): serializável em JSON e entre processos."""
+        return {"nodes": self.nodes, "backtracks": self.backtracks, "eliminations": self.eliminations,
+                "max_depth": self.max_depth, "solutions": self.solutions,
+                "first_solution": self.first_solution, "phases": dict(self.phases)}
+
+# =============================================================
+#                     FUNÇÕES DE LÓGICA
+# =============================================================
+def new_board():
+    """Cria tabuleiro vazio SIZE × SIZE."""
+    return [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
+
+# Acessos rápidos
+def row(b, y): return b[y]
+def col(b, x): return [b[i][x] for i in range(SIZE)]
+
+def block(b, x, y):
+    """Retorna todas as células do bloco onde (x, y) está."""
+    bx = (x // BOX_COLS) * BOX_COLS
+    by = (y // BOX_ROWS) * BOX_ROWS
+    return [b[j][i] for j in range(by, by + BOX_ROWS)
+                       for i in range(bx, bx + BOX_COLS)]
+
+def valid_number(b, x, y, n):
+    """Checa se n é válido na posição (x, y)."""
+    return n not in row(b, y) and n not in col(b, x) and n not in block(b, x, y)
+
+# -------------------------------------------------------------
+#  TABULEIRO COMPACTO (bytearray plano: índice y * SIZE + x, 0 = vazia)
+# -------------------------------------------------------------
+# Solvers e gerador trabalham nesse formato: um byte por célula, cópia = fatia
+# (f[:]) e nenhuma comparação com EMPTY. A interface continua com listas de listas.
+def to_flat(b):
+    """Tabuleiro em listas → bytearray plano novo; um bytearray é só copiado."""
+    if isinstance(b, (bytes, bytearray)): return bytearray(b)
+    return bytearray(0 if v == EMPTY else v for r in b for v in r)
+
+def from_flat(f):
+    """Inverso de to_flat: bytearray plano → listas SIZE × SIZE com EMPTY nas vazias."""
+    return [[v or EMPTY for v in f[y * SIZE:(y + 1) * SIZE]] for y in range(SIZE)]
+
+def copy_into(b, f):
+    """Escreve o tabuleiro plano f no tabuleiro em listas b (mesmos objetos de linha)."""
+    for y in range(SIZE):
+        b[y][:] = [v or EMPTY for v in f[y * SIZE:(y + 1) * SIZE]]
+
+def flat_solver(engine):
+    """
+    Adapta um motor que resolve bytearray no lugar para aceitar também listas:
+    resolve uma cópia plana e, se der certo, copia a solução de volta.
+    Todo motor aceita stats=SolveStats(...) para coletar estatísticas da busca.
+    """
+    def solve(b, randomize=False, stats=None):
+        if isinstance(b, bytearray): return engine(b, randomize, stats)
+        f  = to_flat(b)
+        ok = engine(f, randomize, stats)
+        if ok: copy_into(b, f)
+        return ok
+    solve.__name__, solve.__doc__ = engine.__name__, engine.__doc__
+    return solve
+
+# -------------------------------------------------------------
+#  FORMATO TEXTO (uma linha por puzzle)
+# -------------------------------------------------------------
+DIGITS = "123456789ABCDEFGHI"         # símbolo de cada dígito (1..18); "." ou "0" = vazio
+
+def puzzle_size(line):
+    """SIZE de um puzzle em texto (SIZE² caracteres); ValueError se o tamanho não for suportado."""
+    sz = int(len(line) ** 0.5)
+    if sz * sz != len(line) or sz % 3 or not 3 <= sz <= len(DIGITS):
+        raise ValueError(f"puzzle com {len(line)} caracteres não é SIZE² de um tamanho suportado")
+    return sz
+
+def parse_puzzle(line, flat=False):
+    """
+    Converte uma linha SIZE² (geometria atual) em tabuleiro; "." ou "0" são células vazias.
+    Com flat=True devolve o bytearray plano em vez de listas.
+    """
+    line = line.strip().upper()
+    if len(line) != SIZE * SIZE:
+        raise ValueError(f"esperava {SIZE * SIZE} caracteres, veio {len(line)}")
+    f = bytearray(SIZE * SIZE)
+    for i, ch in enumerate(line):
+        if ch in ".0": continue
+        n = DIGITS.find(ch) + 1
+        if not 1 <= n <= SIZE:
+            raise ValueError(f"símbolo inválido {ch!r} para tabuleiro {SIZE}×{SIZE}")
+        f[i] = n
+    return f if flat else from_flat(f)
+
+def format_board(b):
+    """Inverso de parse_puzzle: tabuleiro (listas ou plano) → linha de texto com "." nas vazias."""
+    if isinstance(b, (bytes, bytearray)):
+        return "".join(DIGITS[v - 1] if v else "." for v in b)
+    return "".join("." if v == EMPTY else DIGITS[v - 1] for r in b for v in r)
+
+def is_board_consistent(b):
+    """Verifica se não há repetições (listas ou plano) – usado para entrada manual."""
+    f = b if isinstance(b, (bytes, bytearray)) else to_flat(b)
+    for unit in unit_tables()[0]:
+        seen = 0
+        for i in unit:
+            bit = 1 << f[i]
+            if bit > 1:
+                if seen & bit: return False
+                seen |= bit
+    return True
+
+class ConflictTracker:
+    """
+    Contagem de cada dígito por unidade (linha, coluna e bloco) de um tabuleiro em listas,
+    mantida em O(1) a cada edição feita por set(). Responde na hora se há repetição
+    (consistent) e quais células repetem (conflicting), sem varrer o tabuleiro como
+    is_board_consistent. Vale para a geometria em vigor na criação.
+
+    Também mantém os candidatos (anotações) de cada célula vazia: dígitos ausentes
+    das suas três unidades, em máscara (bit n-1 ⇒ n). Uma edição só recalcula, nos
+    pares da célula, os bits do dígito que saiu e do que entrou.
+    """
+
+    def __init__(self, b):
+        self.board   = b
+        self.counts  = [[0] * (SIZE + 1) for _ in range(3 * SIZE)]  # unidade → dígito → ocorrências
+        self.clashes = 0                                            # pares (unidade, dígito) repetidos
+        for y in range(SIZE):
+            for x in range(SIZE):
+                if b[y][x] != EMPTY: self._count(x, y, b[y][x], 1)
+        self.peers = unit_tables()[1]
+        self.cand  = [self._candidates(i % SIZE, i // SIZE) for i in range(SIZE * SIZE)]  # y * SIZE + x
+
+    def _units(self, x, y):
+        """Índices das três unidades de (x, y): linha, SIZE + coluna, 2·SIZE + bloco."""
+        return y, SIZE + x, 2 * SIZE + box_index(x, y)
+
+    def _count(self, x, y, n, delta):
+        for u in self._units(x, y):
+            c = self.counts[u]
+            c[n] += delta
+            if   delta > 0 and c[n] == 2: self.clashes += 1   # passou a repetir
+            elif delta < 0 and c[n] == 1: self.clashes -= 1   # deixou de repetir
+
+    def _candidates(self, x, y):
+        if self.board[y][x] != EMPTY: return 0
+        r, c, k = (self.counts[u] for u in self._units(x, y))
+        return sum(1 << (n - 1) for n in range(1, SIZE + 1) if not (r[n] or c[n] or k[n]))
+
+    def set(self, x, y, v):
+        """Escreve v (dígito ou EMPTY) em (x, y) e atualiza as contagens e os candidatos dos pares."""
+        old = self.board[y][x]
+        if old == v: return
+        if old != EMPTY: self._count(x, y, old, -1)
+        if v   != EMPTY: self._count(x, y, v, 1)
+        self.board[y][x] = v
+        i = y * SIZE + x
+        self.cand[i] = self._candidates(x, y)
+        for n in (old, v):
+            if n == EMPTY: continue
+            bit = 1 << (n - 1)
+            for j in self.peers[i]:
+                px, py = j % SIZE, j // SIZE
+                if self.board[py][px] != EMPTY: continue
+                if any(self.counts[u][n] for u in self._units(px, py)): self.cand[j] &= ~bit
+                else: self.cand[j] |= bit
+
+    def candidates(self, x, y):
+        """Máscara dos dígitos que ainda cabem em (x, y); 0 se a célula está preenchida."""
+        return self.cand[y * SIZE + x]
+
+    def consistent(self):
+        """Equivalente a is_board_consistent(board), em O(1)."""
+        return not self.clashes
+
+    def conflicting(self, x, y):
+        """True se o dígito em (x, y) se repete em alguma das suas unidades."""
+        v = self.board[y][x]
+        return v != EMPTY and any(self.counts[u][v] > 1 for u in self._units(x, y))
+
+def box_index(x, y):
+    """Índice do bloco (0..SIZE-1) onde (x, y) está, em ordem de leitura."""
+    return (y // BOX_ROWS) * (SIZE // BOX_COLS) + x // BOX_COLS
+
+def build_masks(f):
+    """
+    Monta, para o tabuleiro plano f, as máscaras de ocupação de linhas, colunas e blocos
+    (bit n-1 ⇒ dígito n presente) e a lista de índices das células vazias em ordem de leitura.
+    """
+    rows, cols, boxes = [0] * SIZE, [0] * SIZE, [0] * SIZE
+    empties = []
+    for i, (x, y, k) in enumerate(unit_tables()[2]):
+        v = f[i]
+        if not v:
+            empties.append(i)
+        else:
+            bit = 1 << (v - 1)
+            rows[y] |= bit; cols[x] |= bit; boxes[k] |= bit
+    return rows, cols, boxes, empties
+
+@flat_solver
+def solve_backtracking(b, randomize=False, stats=None):
+    """
+    Resolve com backtracking sobre máscaras de bits.
+    As máscaras de linha/coluna/bloco são atualizadas a cada colocação/remoção,
+    então os candidatos de uma célula saem de um único AND/NOT.
+    Se randomize=True, embaralha a ordem de tentativas (útil para gerar puzzles).
+    """
+    stats = stats or SolveStats()
+    start = time.perf_counter()
+    rows, cols, boxes, empties = build_masks(b)
+    cells = unit_tables()[2]
+    full  = (1 << SIZE) - 1
+    stats.timed("setup", start)
+
+    def place(i):
+        if i == len(empties):              # tabuleiro completo
+            stats.solution(); return True
+        c = empties[i]
+        x, y, k = cells[c]
+        free = full & ~(rows[y] | cols[x] | boxes[k])
+        nums = [n for n in range(1, SIZE + 1) if free >> (n - 1) & 1]
+        if randomize: random.shuffle(nums)
+        for n in nums:
+            stats.node(i)
+            bit = 1 << (n - 1)
+            b[c] = n; rows[y] |= bit; cols[x] |= bit; boxes[k] |= bit
+            if place(i + 1): return True
+            b[c] = 0; rows[y] ^= bit; cols[x] ^= bit; boxes[k] ^= bit
+            stats.backtrack(i)
+        return False
+
+    start = time.perf_counter()
+    try:
+        return place(0)
+    finally:
+        stats.timed("search", start)
+
+class StepSolver:
+    """
+    Backtracking iterativo, com pilha explícita em vez de recursão: avança em fatias
+    e pode ser pausado e retomado (animação, loop de jogo a 60 FPS) e não depende do
+    limite de recursão do Python. b é o tabuleiro plano, alterado no lugar a cada passo.
+
+    Um passo é uma tentativa (colocar um dígito) ou um retrocesso. run() avança até
+    resolver ou esgotar, ou até steps passos ou budget segundos, e devolve status:
+    True (resolvido, solução em b), False (sem solução) ou None (pausado).
+    Com mrv=True, cada nível primeiro propaga singles como _mrv_walk (colocações que
+    não contam como passos e são desfeitas junto com o nível) e depois ramifica na
+    célula vazia com menos candidatos – a mesma árvore do solve_mrv, que dá conta
+    dos tabuleiros grandes; sem ele, segue a ordem do tabuleiro.
+    """
+    TIME_CHECK = 64    # passos entre consultas ao relógio quando há budget (1 com mrv: cada nível propaga)
+
+    def __init__(self, b, randomize=False, mrv=False, stats=None):
+        self.board = b
+        self.randomize, self.mrv = randomize, mrv
+        self.stats = stats or SolveStats()
+        start = time.perf_counter()
+        self.rows, self.cols, self.boxes, self.empties = build_masks(b)
+        self.cells  = unit_tables()[2]
+        self.stack  = []     # um quadro por nível: [célula, dígitos a tentar, dígito colocado
+                             # (0 = nenhum), colocações da propagação (célula, bit)]
+        self.status = None
+        self.steps  = 0      # passos dados até agora
+        self.stats.timed("setup", start)
+        self._open = True    # abrir um nível novo antes do próximo passo
+
+    def run(self, steps=None, budget=None):
+        """Avança no máximo steps passos e/ou budget segundos (None = sem limite); devolve status."""
+        b, cells, stack, stats, empties = self.board, self.cells, self.stack, self.stats, self.empties
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        full, mrv, randomize = (1 << SIZE) - 1, self.mrv, self.randomize
+        check = 1 if mrv else self.TIME_CHECK
+        start = time.perf_counter()
+        deadline = start + budget if budget is not None else None
+        limit    = steps if steps is not None else float("inf")
+        need, done, depth, status = self._open, 0, len(stack) - 1, self.status
+        while status is None:
+            if need:                                    # próxima célula (ou tabuleiro completo)
+                trail = []
+                if mrv:
+                    t = time.perf_counter()
+                    ok = _propagate_singles(b, rows, cols, boxes, trail, stats)
+                    stats.timed("propagate", t)
+                    if not ok:                          # contradição: o dígito do nível acima falhou
+                        _undo_trail(b, rows, cols, boxes, trail)
+                        need = False
+                        if depth < 0: status = False
+                        continue
+                    best, count = None, SIZE + 1
+                    for c in empties:
+                        if b[c]: continue
+                        x, y, k = cells[c]
+                        n = (full & ~(rows[y] | cols[x] | boxes[k])).bit_count()
+                        if n < count:
+                            best, count = c, n
+                            if n == 2: break            # propagação garante ≥ 2 aqui
+                else:
+                    best = empties[depth + 1] if depth + 1 < len(empties) else None
+                if best is None:
+                    status = True; stats.solution(); break
+                x, y, k = cells[best]
+                free = full & ~(rows[y] | cols[x] | boxes[k])
+                nums = [n for n in range(SIZE, 0, -1) if free >> (n - 1) & 1]   # pop() tenta do menor
+                if randomize: random.shuffle(nums)
+                stack.append([best, nums, 0, trail]); depth += 1
+                need = False
+            if done >= limit: break
+            if deadline is not None and done % check == 0 and done and time.perf_counter() >= deadline:
+                break
+            done += 1
+            frame = stack[depth]
+            c, nums, placed, trail = frame
+            x, y, k = cells[c]
+            if placed:                                  # a subárvore deste dígito falhou
+                bit = 1 << (placed - 1)
+                b[c] = 0; rows[y] ^= bit; cols[x] ^= bit; boxes[k] ^= bit
+                frame[2] = 0
+                stats.backtrack(depth)
+            if not nums:                                # nível esgotado: volta ao anterior
+                _undo_trail(b, rows, cols, boxes, trail)
+                stack.pop(); depth -= 1
+                if depth < 0: status = False
+                continue
+            n = nums.pop()
+            bit = 1 << (n - 1)
+            b[c] = n; rows[y] |= bit; cols[x] |= bit; boxes[k] |= bit
+            frame[2] = n
+            stats.node(depth)
+            need = True
+        self._open, self.status = need, status
+        self.steps += done
+        stats.timed("search", start)
+        return status
+
+def units():
+    """Todas as unidades (linhas, colunas e blocos BOX_ROWS × BOX_COLS) como listas de (x, y, bloco)."""
+    us  = [[(x, y, box_index(x, y)) for x in range(SIZE)] for y in range(SIZE)]
+    us += [[(x, y, box_index(x, y)) for y in range(SIZE)] for x in range(SIZE)]
+    us += [[(x, y, box_index(x, y)) for y in range(by, by + BOX_ROWS)
+                                     for x in range(bx, bx + BOX_COLS)]
+           for by in range(0, SIZE, BOX_ROWS) for bx in range(0, SIZE, BOX_COLS)]
+    return us
+
+_TABLES = {}   # (SIZE, BOX_ROWS) → (unidades, pares, células) em índices y * SIZE + x
+
+def unit_tables():
+    """
+    Tabelas do tabuleiro plano, calculadas uma vez por geometria:
+    unidades e pares (peers) de cada célula em índices y * SIZE + x,
+    e (x, y, bloco) de cada índice.
+    """
+    key = (SIZE, BOX_ROWS)
+    if key not in _TABLES:
+        us    = [[y * SIZE + x for x, y, _ in u] for u in units()]
+        peers = [set() for _ in range(SIZE * SIZE)]
+        for u in us:
+            for i in u: peers[i].update(u)
+        cells = [(x, y, box_index(x, y)) for y in range(SIZE) for x in range(SIZE)]
+        _TABLES[key] = us, [sorted(p - {i}) for i, p in enumerate(peers)], cells
+    return _TABLES[key]
+
+def _undo_trail(b, rows, cols, boxes, trail):
+    """Desfaz, da última para a primeira, as colocações (célula, bit) de trail e o esvazia."""
+    cells = unit_tables()[2]
+    for i, bit in reversed(trail):
+        x, y, k = cells[i]
+        b[i] = 0; rows[y] ^= bit; cols[x] ^= bit; boxes[k] ^= bit
+    trail.clear()
+
+def _propagate_singles(b, rows, cols, boxes, trail, stats):
+    """
+    Propagação de singles da busca MRV (_mrv_walk, StepSolver com mrv=True): aplica
+    naked/hidden singles em b e nas máscaras até estabilizar, anotando cada colocação
+    (célula, bit) em trail para _undo_trail; False se achar contradição.
+    Os candidatos são calculados uma vez e depois só os pares da célula colocada mudam.
+    """
+    full = (1 << SIZE) - 1
+    us, peers, cells = unit_tables()
+    cand, queue = [0] * len(cells), []
+    for i, (x, y, k) in enumerate(cells):
+        if b[i]: continue
+        free = full & ~(rows[y] | cols[x] | boxes[k])
+        if not free: return False
+        cand[i] = free
+        if not free & (free - 1): queue.append(i)
+    eliminated = 0
+
+    def assign(i, bit):
+        nonlocal eliminated
+        x, y, k = cells[i]
+        b[i] = bit.bit_length(); rows[y] |= bit; cols[x] |= bit; boxes[k] |= bit
+        trail.append((i, bit)); cand[i] = 0
+        for j in peers[i]:
+            c = cand[j]
+            if c & bit:
+                c ^= bit; cand[j] = c; eliminated += 1
+                if not c: return False
+                if not c & (c - 1): queue.append(j)
+        return True
+
+    try:
+        while True:
+            while queue:                                # naked singles
+                i = queue.pop()
+                if cand[i] and not assign(i, cand[i]): return False
+            changed = False
+            for unit in us:                             # hidden singles
+                once = twice = placed = 0
+                for i in unit:
+                    c = cand[i]
+                    if c: twice |= once & c; once |= c
+                    else: placed |= 1 << (b[i] - 1)
+                if (once | placed) != full: return False  # dígito sem lugar na unidade
+                single = once & ~twice & ~placed
+                if not single: continue
+                for i in unit:
+                    hit = cand[i] & single
+                    if not hit: continue
+                    if hit & (hit - 1): return False    # única casa de dois dígitos
+                    if not assign(i, hit): return False
+                    changed = True
+            if not changed and not queue: return True
+    finally:
+        stats.eliminations += eliminated
+
+def _mrv_walk(b, randomize=False, max_nodes=None, stats=None, cut=None):
+    """
+    Busca ramificando sempre na célula mais restrita (MRV – menos candidatos).
+    Antes de cada ramificação roda propagação de singles:
+      • naked single  – célula com um único candidato;
+      • hidden single – dígito que só cabe em uma célula da linha/coluna/bloco.
+    Colocações feitas pela propagação não contam como tentativas.
+    b é o tabuleiro plano (bytearray), alterado no lugar.
+    Gerador: produz (yield) a cada solução, com ela em b – copie antes de pedir a
+    próxima; fechar o gerador deixa a solução atual em b. Com cut, não ramifica além
+    da profundidade cut e produz ali o tabuleiro parcial já propagado (subárvores
+    disjuntas). Termina com valor False se passar de max_nodes ramificações.
+    """
+    stats = stats or SolveStats()
+    start = time.perf_counter()
+    rows, cols, boxes, _ = build_masks(b)
+    full = (1 << SIZE) - 1
+    cells = unit_tables()[2]
+    stats.timed("setup", start)
+
+    def put(i, n, trail):
+        x, y, k = cells[i]
+        bit = 1 << (n - 1)
+        b[i] = n; rows[y] |= bit; cols[x] |= bit; boxes[k] |= bit
+        trail.append((i, bit))
+
+    def undo(trail):
+        _undo_trail(b, rows, cols, boxes, trail)
+
+    nodes, over = 0, False
+
+    def search(depth=0):
+        nonlocal nodes, over
+        trail = []
+        start = time.perf_counter()
+        ok = _propagate_singles(b, rows, cols, boxes, trail, stats)
+        stats.timed("propagate", start)
+        if not ok:
+            undo(trail); return
+        best, best_free, best_count = None, 0, SIZE + 1
+        for i, (x, y, k) in enumerate(cells):           # célula mais restrita
+            if b[i]: continue
+            free  = full & ~(rows[y] | cols[x] | boxes[k])
+            count = free.bit_count()
+            if count < best_count:
+                best, best_free, best_count = i, free, count
+                if count == 2: break                    # propagação garante ≥ 2 aqui
+        if best is None or depth == cut:                # tabuleiro completo (ou subproblema)
+            if best is None: stats.solution()
+            yield
+            undo(trail); return
+        nums = [n for n in range(1, SIZE + 1) if best_free >> (n - 1) & 1]
+        if randomize: random.shuffle(nums)
+        for n in nums:
+            nodes += 1; stats.node(depth)
+            if max_nodes is not None and nodes > max_nodes:
+                over = True; return                     # estourou o orçamento
+            branch = []
+            put(best, n, branch)
+            yield from search(depth + 1)
+            if over: return
+            undo(branch)
+            stats.backtrack(depth)
+        undo(trail)
+
+    start = time.perf_counter()
+    try:
+        yield from search()
+    finally:
+        stats.timed("search", start)
+    return not over
+
+def _mrv_search(b, randomize=False, limit=1, max_nodes=None, stats=None):
+    """
+    Conta soluções com _mrv_walk. Para ao achar limit (None = todas), deixando a
+    última em b, e retorna quantas achou, ou None se passar de max_nodes
+    ramificações antes de decidir.
+    """
+    walk, found = _mrv_walk(b, randomize, max_nodes, stats), 0
+    while True:
+        try:
+            next(walk)
+        except StopIteration as end:
+            return found if end.value else None
+        found += 1
+        if limit is not None and found >= limit:
+            walk.close(); return found
+
+@flat_solver
+def solve_mrv(b, randomize=False, stats=None):
+    """Resolve com MRV + propagação de singles (ver _mrv_search)."""
+    return _mrv_search(b, randomize, stats=stats) == 1
+
+def count_solutions(b, limit=2, max_nodes=None, stats=None):
+    """
+    Conta as soluções de b (listas ou plano, sem alterá-lo), parando em limit – basta 2
+    para testar unicidade; None conta todas. Com max_nodes, desiste após tantas
+    ramificações e retorna None (indeciso).
+    """
+    return _mrv_search(to_flat(b), limit=limit, max_nodes=max_nodes, stats=stats)
+
+def iter_solutions(b, limit=None, randomize=False, stats=None):
+    """
+    Gera as soluções de b (listas ou plano, sem alterá-lo) sob demanda, como
+    tabuleiros planos novos, até limit (None = todas). Tabuleiro com pistas
+    repetidas não gera nenhuma.
+    """
+    f = to_flat(b)
+    if not is_board_consistent(f): return
+    for found, _ in enumerate(_mrv_walk(f, randomize, stats=stats), 1):
+        yield bytearray(f)
+        if limit is not None and found >= limit: return
+
+def split_search(b, depth, stats=None):
+    """
+    Divide a busca de b em subproblemas independentes: os tabuleiros planos (já
+    propagados) nos nós de profundidade depth da árvore MRV, mais as soluções achadas
+    antes dela. As soluções de b são a união disjunta das soluções dos subproblemas.
+    """
+    f = to_flat(b)
+    if not is_board_consistent(f): return []
+    return [bytearray(f) for _ in _mrv_walk(f, cut=depth, stats=stats)]
+
+def exact_cover_matrix():
+    """
+    Modela o Sudoku como cobertura exata (Algorithm X).
+    Cada linha (x, y, n) = "dígito n na célula (x, y)" cobre 4 restrições:
+      ("c", célula) · ("r", linha, n) · ("k", coluna, n) · ("b", bloco, n)
+    Retorna X (restrição → conjunto de linhas) e Y (linha → restrições).
+    """
+    Y = {}
+    for y in range(SIZE):
+        for x in range(SIZE):
+            k = box_index(x, y)
+            for n in range(1, SIZE + 1):
+                Y[(x, y, n)] = [("c", y * SIZE + x), ("r", y, n), ("k", x, n), ("b", k, n)]
+    X = {}
+    for r, cs in Y.items():
+        for c in cs:
+            X.setdefault(c, set()).add(r)
+    return X, Y
+
+def _cover(X, Y, r):
+    """Seleciona a linha r: remove suas restrições e as linhas que conflitam com ela."""
+    removed = []
+    for j in Y[r]:
+        for i in X[j]:
+            for k in Y[i]:
+                if k != j: X[k].remove(i)
+        removed.append(X.pop(j))
+    return removed
+
+def _uncover(X, Y, r, removed):
+    """Desfaz _cover na ordem inversa (os "dancing links" do Knuth, em dicionários)."""
+    for j in reversed(Y[r]):
+        X[j] = removed.pop()
+        for i in X[j]:
+            for k in Y[i]:
+                if k != j: X[k].add(i)
+
+@flat_solver
+def solve_exact_cover(b, randomize=False, stats=None):
+    """
+    Resolve via Algorithm X (cobertura exata) para qualquer SIZE e blocos BOX_ROWS × BOX_COLS.
+    Sempre ramifica na restrição com menos linhas restantes (heurística de tamanho da coluna).
+    """
+    stats = stats or SolveStats()
+    start = time.perf_counter()
+    X, Y = exact_cover_matrix()
+    for i, n in enumerate(b):                  # pistas já entram selecionadas
+        if not n: continue
+        y, x = divmod(i, SIZE)
+        if any(c not in X for c in Y[(x, y, n)]):  # pista repetida
+            stats.timed("setup", start); return False
+        _cover(X, Y, (x, y, n))
+    stats.timed("setup", start)
+
+    def search(depth=0):
+        if not X:                              # todas as restrições cobertas
+            stats.solution(); return True
+        c = min(X, key=lambda c: len(X[c]))
+        options = list(X[c])
+        if randomize: random.shuffle(options)
+        for r in options:
+            stats.node(depth)
+            x, y, n = r
+            b[y * SIZE + x] = n
+            removed = _cover(X, Y, r)
+            if search(depth + 1): return True
+            _uncover(X, Y, r, removed)
+            b[y * SIZE + x] = 0
+            stats.backtrack(depth)
+        return False
+
+    start = time.perf_counter()
+    try:
+        return search()
+    finally:
+        stats.timed("search", start)
+
+# motores disponíveis para Solve/Check e generate_puzzle
+SOLVERS = {
+    "backtracking": solve_backtracking,
+    "mrv":          solve_mrv,
+    "dlx":          solve_exact_cover,
+}
+SOLVE_ENGINE = "mrv"     # padrão do Solve/Check e dos lotes; dlx fica disponível em SOLVERS
+
+UNIQUE_NODE_BUDGET = 3  # ramificações por teste de unicidade no gerador; acima disso a pista fica
+
+def generate_full_grid():
+    """
+    Gera um tabuleiro completo válido (plano) sem busca, em tempo constante:
+    parte do padrão base da geometria BOX_ROWS × BOX_COLS e embaralha com
+    transformações que preservam a validade – troca de dígitos, linhas dentro
+    da banda, colunas dentro da pilha, bandas, pilhas e transposição (blocos quadrados).
+    """
+    digits = list(range(1, SIZE + 1)); random.shuffle(digits)
+
+    def shuffled(group, count):
+        """Permuta grupos de tamanho group e, dentro de cada um, seus elementos."""
+        order = random.sample(range(count), count)
+        return [g * group + i for g in order for i in random.sample(range(group), group)]
+
+    rows = shuffled(BOX_ROWS, SIZE // BOX_ROWS)    # bandas têm BOX_ROWS linhas
+    cols = shuffled(BOX_COLS, SIZE // BOX_COLS)    # pilhas têm BOX_COLS colunas
+    # padrão base: linha r desloca BOX_COLS por linha da banda e 1 por banda
+    if BOX_ROWS == BOX_COLS and random.random() < 0.5:
+        rows, cols = cols, rows                    # transposição: troca os papéis
+        pattern = lambda r, c: digits[(BOX_COLS * (c % BOX_ROWS) + c // BOX_ROWS + r) % SIZE]
+    else:
+        pattern = lambda r, c: digits[(BOX_COLS * (r % BOX_ROWS) + r // BOX_ROWS + c) % SIZE]
+    return bytearray(pattern(r, c) for r in rows for c in cols)
+
+def generate_puzzle(clue_ratio=0.45, engine=None, clues=None, unique=False, symmetric=False, flat=False,
+                    stats=None):
+    """
+    1) Gera tabuleiro completamente preenchido (generate_full_grid, ou busca aleatória
+       com o motor engine se informado)
+    2) Remove células até restar clue_ratio de pistas (ou exatamente clues, se informado)
+
+    Com unique=True cada remoção só é mantida se o puzzle continuar com solução única
+    (count_solutions parando em 2); clues/clue_ratio passa a ser o piso de pistas, e a
+    remoção para antes se nenhuma outra pista puder sair. Com symmetric=True as pistas
+    saem aos pares simétricos pelo centro (rotação de 180°).
+    Com flat=True devolve o tabuleiro plano (bytearray) em vez de listas.
+    stats (SolveStats) acumula as buscas feitas e as fases "grid" e "dig".
+    """
+    stats = stats or SolveStats()
+    start = time.perf_counter()
+    if engine:
+        full = bytearray(SIZE * SIZE)
+        SOLVERS[engine](full, randomize=True, stats=stats)
+    else:
+        full = generate_full_grid()
+    stats.timed("grid", start)
+    start = time.perf_counter()
+
+    puzzle = full[:]
+    total    = SIZE * SIZE
+    if clues is None: clues = int(total * clue_ratio)
+    to_blank = total - clues
+
+    cells = list(range(total)); random.shuffle(cells)
+    if not unique and not symmetric:
+        for _ in range(to_blank): puzzle[cells.pop()] = 0
+        stats.timed("dig", start)
+        return puzzle if flat else from_flat(puzzle)
+
+    for i in cells:
+        if to_blank <= 0: break
+        group = {i, total - 1 - i} if symmetric else {i}
+        if len(group) > to_blank or any(not puzzle[j] for j in group):
+            continue
+        for j in group: puzzle[j] = 0
+        if unique and not _still_unique(puzzle, full, group, stats):
+            for j in group: puzzle[j] = full[j]
+            continue
+        to_blank -= len(group)
+    stats.timed("dig", start)
+    return puzzle if flat else from_flat(puzzle)
+
+def _still_unique(puzzle, full, removed, stats=None):
+    """
+    True se puzzle (plano, já sem as pistas removed) comprovadamente ainda tem só a solução full.
+    Se cada célula removida é forçada por um single (naked ou hidden) nem precisa buscar;
+    senão conta até 2 soluções com orçamento UNIQUE_NODE_BUDGET (indeciso conta como não).
+    """
+    rows, cols, boxes, _ = build_masks(puzzle)
+    us, _, cells = unit_tables()
+    mask = (1 << SIZE) - 1
+    cand = lambda i: mask & ~(rows[cells[i][1]] | cols[cells[i][0]] | boxes[cells[i][2]])
+    for j in removed:
+        bit = 1 << (full[j] - 1)
+        if cand(j) != bit and not any(all(i == j or puzzle[i] or not cand(i) & bit for i in u)
+                                      for u in us if j in u):
+            return count_solutions(puzzle, 2, UNIQUE_NODE_BUDGET, stats) == 1
+    return True
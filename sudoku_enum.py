@@ -0,0 +1,88 @@
+"""
+Contagem e listagem de todas as soluções de um tabuleiro pouco restrito.
+
+A listagem é preguiçosa (sudoku_core.iter_solutions). A contagem em paralelo
+corta a árvore MRV numa profundidade (split_search) em subproblemas
+independentes – bem mais numerosos que os workers – e os distribui um a um
+por um pool de processos: quem termina uma subárvore pequena já pega a
+próxima, então subárvores desiguais não deixam núcleos parados.
+
+    python sudoku_enum.py "8..........36......7..9.2..." -w 8
+    python sudoku_enum.py puzzle.txt --list -n 100
+"""
+import argparse, multiprocessing as mp, os, sys, time
+
+import sudoku_core as core
+
+SPLIT_FACTOR    = 16   # subproblemas desejados por worker (sobra trabalho para quem acabar antes)
+MAX_SPLIT_DEPTH = 12   # profundidade máxima do corte automático
+
+def _count_task(args):
+    """Tarefa de um worker: conta as soluções de um subproblema (plano, em bytes)."""
+    size, box_rows, sub, limit = args
+    if (size, box_rows) != (core.SIZE, core.BOX_ROWS): core.configure(size, box_rows)
+    return core.count_solutions(bytearray(sub), limit=limit)
+
+def split(b, workers, depth=None):
+    """
+    Subproblemas de b para workers processos: na profundidade depth ou, sem ela,
+    na primeira que render SPLIT_FACTOR × workers subproblemas (até MAX_SPLIT_DEPTH).
+    """
+    if depth is not None: return core.split_search(b, depth)
+    for depth in range(MAX_SPLIT_DEPTH + 1):
+        subs = core.split_search(b, depth)
+        if len(subs) >= SPLIT_FACTOR * workers: break
+    return subs
+
+def count_parallel(b, limit=None, workers=None, depth=None):
+    """
+    Conta as soluções de b (listas ou plano) em paralelo, parando em limit (None = todas).
+    depth fixa a profundidade do corte (ver split); com um worker ou um subproblema só,
+    conta no próprio processo.
+    """
+    workers = workers or os.cpu_count() or 1
+    subs  = split(b, workers, depth)
+    tasks = ((core.SIZE, core.BOX_ROWS, bytes(s), limit) for s in subs)
+    total = 0
+    if workers == 1 or len(subs) <= 1:
+        for t in tasks:
+            total += _count_task(t)
+            if limit is not None and total >= limit: break
+    else:
+        with mp.Pool(workers) as pool:                    # sair do with encerra os workers
+            for n in pool.imap_unordered(_count_task, tasks, chunksize=1):
+                total += n
+                if limit is not None and total >= limit: break
+    return total if limit is None else min(total, limit)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Conta ou lista as soluções de um puzzle.")
+    ap.add_argument("puzzle", help="puzzle em texto (SIZE² caracteres) ou arquivo com ele na 1ª linha")
+    ap.add_argument("-n", "--limit", type=int, help="parar após tantas soluções")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="processos de contagem")
+    ap.add_argument("-d", "--depth", type=int, help="profundidade do corte (padrão: automática)")
+    ap.add_argument("--list", action="store_true", help="escrever as soluções, uma por linha")
+    args = ap.parse_args(argv)
+
+    line = args.puzzle
+    if os.path.exists(line):
+        with open(line, encoding="utf-8") as f: line = f.readline()
+    try:
+        sz = core.puzzle_size(line.strip())
+        core.configure(sz)
+        b = core.parse_puzzle(line.strip(), flat=True)
+    except ValueError as e:
+        sys.exit(f"puzzle inválido: {e}")
+
+    start = time.perf_counter()
+    if args.list:
+        total = 0
+        for sol in core.iter_solutions(b, args.limit):
+            print(core.format_board(sol)); total += 1
+    else:
+        total = count_parallel(b, args.limit, args.workers, args.depth)
+        print(total)
+    print(f"{total} soluções em {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
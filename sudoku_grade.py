@@ -0,0 +1,236 @@
+"""
+Classificação de dificuldade e geração por faixa.
+
+grade() resolve o puzzle só com lógica, sempre pela técnica mais simples que
+avança (volta aos singles a cada avanço), e o classifica pela mais difícil que
+precisou usar:
+
+    singles  – naked/hidden singles
+    pairs    – pares nus e ocultos
+    pointing – interseção bloco × linha/coluna (pointing e claiming)
+    fish     – X-Wing e Swordfish
+    guessing – a lógica empaca e sobra busca (nós contados pelo MRV)
+
+Tudo em máscaras de bits sobre o tabuleiro plano, barato o bastante para o laço
+gerar-e-testar de generate_graded.
+
+    python sudoku_grade.py puzzles.txt
+    python sudoku_grade.py --generate dificil -s 9 -n 5
+"""
+import argparse, itertools, sys
+
+import sudoku_core as core
+
+TECHNIQUES = ("singles", "pairs", "pointing", "fish", "guessing")
+
+# faixa → (técnica mais fácil, mais difícil) aceitas como a mais difícil usada
+# (no 9 × 9 gerado com piso de 0.30: ~70% singles, ~10% pairs, ~3% pointing/fish, ~17% guessing)
+BANDS = {"facil":   ("singles",  "singles"),
+         "medio":   ("pairs",    "pairs"),
+         "dificil": ("pointing", "fish"),
+         "extremo": ("guessing", "guessing")}
+
+# piso de pistas por faixa ao gerar (menos pistas ⇒ mais chance de técnicas difíceis;
+# abaixo de ~0.30 não muda nada no 9 × 9: o gerador com unicidade para por volta de 24 pistas)
+BAND_CLUES = {"facil": 0.45, "medio": 0.30, "dificil": 0.30, "extremo": 0.30}
+
+GRADE_TRIES = 250  # puzzles gerados no máximo por generate_graded (dificil acerta ~1 em 35)
+
+class _Grid:
+    """Candidatos (máscaras) de um tabuleiro plano, com colocação e eliminação propagadas aos pares."""
+
+    def __init__(self, f):
+        self.b = f
+        self.units, self.peers, cells = core.unit_tables()
+        rows, cols, boxes, _ = core.build_masks(f)
+        full = (1 << core.SIZE) - 1
+        self.cand = [0 if f[i] else full & ~(rows[y] | cols[x] | boxes[k])
+                     for i, (x, y, k) in enumerate(cells)]
+        self.dead = any(not f[i] and not c for i, c in enumerate(self.cand))
+
+    def place(self, i, bit):
+        self.b[i] = bit.bit_length(); self.cand[i] = 0
+        for j in self.peers[i]:
+            if self.cand[j] & bit:
+                self.cand[j] ^= bit
+                if not self.cand[j] and not self.b[j]: self.dead = True
+
+    def eliminate(self, cells, bits):
+        """Tira bits das células cells; True se algo mudou."""
+        changed = False
+        for i in cells:
+            if self.cand[i] & bits:
+                self.cand[i] &= ~bits; changed = True
+                if not self.cand[i]: self.dead = True
+        return changed
+
+    def where(self, unit, bit):
+        return [i for i in unit if self.cand[i] & bit]
+
+    def singles(self):
+        for i, c in enumerate(self.cand):               # naked single
+            if c and not c & (c - 1):
+                self.place(i, c); return True
+        for unit in self.units:                         # hidden single
+            once = twice = 0
+            for i in unit:
+                c = self.cand[i]; twice |= once & c; once |= c
+            single = once & ~twice
+            if single:
+                bit = single & -single
+                self.place(self.where(unit, bit)[0], bit); return True
+        return False
+
+    def pairs(self):
+        changed = False
+        for unit in self.units:
+            open_ = [i for i in unit if self.cand[i]]
+            for i, j in itertools.combinations(open_, 2):     # par nu
+                c = self.cand[i]
+                if c == self.cand[j] and c.bit_count() == 2:
+                    changed |= self.eliminate([k for k in open_ if k not in (i, j)], c)
+            spots = {}                                          # par oculto
+            for d in range(core.SIZE):
+                cells = tuple(self.where(open_, 1 << d))
+                if len(cells) == 2: spots.setdefault(cells, []).append(d)
+            for cells, ds in spots.items():
+                if len(ds) == 2:
+                    keep = (1 << ds[0]) | (1 << ds[1])
+                    changed |= self.eliminate(cells, ~keep)
+            if changed: return True
+        return False
+
+    def pointing(self):
+        S = core.SIZE
+        rows, cols, boxes = self.units[:S], self.units[S:2 * S], self.units[2 * S:]
+        for d in range(S):
+            bit = 1 << d
+            for box in boxes:                               # pointing: bloco → linha/coluna
+                spots = self.where(box, bit)
+                if len(spots) < 2: continue
+                for lines, of in ((rows, lambda i: i // S), (cols, lambda i: i % S)):
+                    if len({of(i) for i in spots}) == 1:
+                        line = lines[of(spots[0])]
+                        if self.eliminate([i for i in line if i not in box], bit): return True
+            for line in rows + cols:                        # claiming: linha/coluna → bloco
+                spots = self.where(line, bit)
+                if len(spots) < 2: continue
+                k = {core.box_index(i % S, i // S) for i in spots}
+                if len(k) == 1:
+                    box = boxes[k.pop()]
+                    if self.eliminate([i for i in box if i not in line], bit): return True
+        return False
+
+    def fish(self):
+        S = core.SIZE
+        for n in (2, 3):                                    # X-Wing, Swordfish
+            for d in range(S):
+                bit = 1 << d
+                for base, cover, pos in ((self.units[:S], self.units[S:2 * S], lambda i: i % S),
+                                         (self.units[S:2 * S], self.units[:S], lambda i: i // S)):
+                    lines = [(u, {pos(i) for i in self.where(u, bit)}) for u in base]
+                    lines = [(u, p) for u, p in lines if 2 <= len(p) <= n]
+                    for group in itertools.combinations(lines, n):
+                        span = set().union(*(p for _, p in group))
+                        if len(span) != n: continue
+                        inside = {i for u, _ in group for i in u}
+                        if self.eliminate([i for c in span for i in cover[c] if i not in inside], bit):
+                            return True
+        return False
+
+def grade(b, stats=None):
+    """
+    Classifica b (listas ou plano, sem alterá-lo). Devolve um dicionário:
+      level     – técnica mais difícil necessária (TECHNIQUES) ou None se b não tem solução;
+      steps     – quantas vezes cada técnica avançou;
+      nodes     – ramificações da busca que sobrou (0 se a lógica bastou);
+      solutions – 0, 1 ou 2 (= mais de uma).
+    stats (SolveStats) acumula a busca final.
+    """
+    f = core.to_flat(b)
+    steps = dict.fromkeys(TECHNIQUES, 0)
+    report = {"level": None, "steps": steps, "nodes": 0, "solutions": 0}
+    if not core.is_board_consistent(f): return report
+    g, hardest = _Grid(f), 0
+    while not g.dead and not all(f):
+        for rank, name in enumerate(TECHNIQUES[:-1]):
+            if getattr(g, name)():
+                steps[name] += 1; hardest = max(hardest, rank)
+                break
+        else:
+            break                                           # a lógica empacou
+    if all(f) and not g.dead:
+        report.update(level=TECHNIQUES[hardest], solutions=1)
+        return report
+    search = stats or core.SolveStats()
+    before = search.nodes
+    report["solutions"] = core.count_solutions(f, 2, stats=search)
+    report["nodes"] = search.nodes - before
+    if report["solutions"]:
+        steps["guessing"] = 1
+        report["level"] = "guessing"
+    return report
+
+def in_band(report, band):
+    """True se o nível de report cai na faixa band (BANDS)."""
+    lo, hi = (TECHNIQUES.index(t) for t in BANDS[band])
+    return report["level"] is not None and lo <= TECHNIQUES.index(report["level"]) <= hi
+
+def generate_graded(band, tries=GRADE_TRIES, flat=False, stats=None, **gen_kwargs):
+    """
+    Gera puzzles de solução única (generate_puzzle(**gen_kwargs), piso de pistas
+    BAND_CLUES[band] se não informado) até um cair na faixa band, no máximo tries.
+    Devolve (puzzle, report): report é o de grade() mais "rejected" (descartados) e
+    "in_band"; se nenhum acertar, fica o mais próximo da faixa, com in_band False.
+    """
+    gen_kwargs.setdefault("clue_ratio", BAND_CLUES[band])
+    gen_kwargs["unique"] = True
+    target = sum(TECHNIQUES.index(t) for t in BANDS[band]) / 2
+    best = None
+    for rejected in range(tries):
+        puzzle = core.generate_puzzle(flat=True, stats=stats, **gen_kwargs)
+        report = grade(puzzle)
+        if in_band(report, band):
+            best = puzzle, report; break
+        miss = abs(TECHNIQUES.index(report["level"]) - target)
+        if best is None or miss < best[2]: best = puzzle, report, miss
+    else:
+        rejected = tries
+    puzzle, report = best[:2]
+    report.update(rejected=rejected, in_band=rejected < tries)
+    return (puzzle if flat else core.from_flat(puzzle)), report
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Classifica puzzles por técnica ou gera por faixa.")
+    ap.add_argument("input", nargs="?", help="arquivo com um puzzle por linha (padrão: stdin)")
+    ap.add_argument("--generate", choices=list(BANDS), help="gerar puzzles desta faixa em vez de classificar")
+    ap.add_argument("-s", "--size", type=int, default=9, choices=core.SIZE_OPTIONS, help="tamanho ao gerar")
+    ap.add_argument("-n", "--count", type=int, default=1, help="puzzles a gerar")
+    ap.add_argument("--tries", type=int, default=GRADE_TRIES, help="tentativas por puzzle gerado")
+    args = ap.parse_args(argv)
+
+    if args.generate:
+        core.configure(args.size)
+        for _ in range(args.count):
+            puzzle, report = generate_graded(args.generate, args.tries, flat=True)
+            print(core.format_board(puzzle))
+            print(f"{report['level']} nós={report['nodes']} descartados={report['rejected']}"
+                  + ("" if report["in_band"] else " (fora da faixa)"), file=sys.stderr)
+        return
+
+    stream = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    with stream:
+        for line in stream:
+            line = line.strip()
+            if not line: continue
+            try:
+                sz = core.puzzle_size(line)
+                if sz != core.SIZE: core.configure(sz)
+                report = grade(core.parse_puzzle(line, flat=True))
+            except ValueError:
+                print("inválido"); continue
+            used = " ".join(f"{t}={n}" for t, n in report["steps"].items() if n)
+            print(f"{report['level'] or 'sem solução'} nós={report['nodes']} {used}".rstrip())
+
+if __name__ == "__main__":
+    main()
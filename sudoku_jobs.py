@@ -0,0 +1,140 @@
+"""
+Resolução fora da thread da interface.
+
+SolveJob roda um solver do sudoku_core num processo separado e devolve progresso
+(tentativas e profundidade atual) por uma fila; o loop do jogo chama poll() a cada
+quadro, pode cancelar a qualquer momento e o job se encerra sozinho no timeout
+(em segundos; None = sem limite).
+
+Em modo portfólio (strategies=PORTFOLIO) várias variantes – motores, ordens de
+dígitos e sementes diferentes – correm em paralelo, uma por processo; a primeira
+que termina decide, as outras são canceladas e a vencedora fica registrada.
+"""
+import collections, json, multiprocessing as mp, queue, random, time
+
+import sudoku_core as core
+
+REPORT_INTERVAL = 0.1     # intervalo mínimo entre mensagens de progresso do worker
+PROGRESS_EVERY  = 1000    # nós entre consultas ao relógio (não custa um perf_counter por nó)
+
+# estratégias do portfólio: (nome, motor, semente); semente None = ordem fixa,
+# inteiro = randomize=True com essa semente (ordem de dígitos/opções embaralhada)
+PORTFOLIO = (
+    ("dlx",            "dlx",          None),
+    ("mrv",            "mrv",          None),
+    ("backtracking",   "backtracking", None),
+    ("mrv/1",          "mrv",          1),
+    ("backtracking/1", "backtracking", 1),
+    ("backtracking/2", "backtracking", 2),
+)
+
+wins = collections.Counter()   # estratégia → vitórias nesta execução (portfólio)
+
+def _solve_worker(board, size, box_rows, engine, seed, tag, out):
+    """
+    Processo filho: resolve board (plano, em bytes) e publica ("progress", tag, tent., prof.)
+    e depois ("done", tag, …) com a solução também em bytes e o resumo de SolveStats.
+    Com seed, resolve com randomize=True a partir dessa semente.
+    """
+    core.configure(size, box_rows)
+    if seed is not None: random.seed(seed)
+    last = 0.0
+
+    def on_node(stats, depth):
+        nonlocal last
+        if stats.nodes % PROGRESS_EVERY: return
+        now = time.perf_counter()
+        if now - last >= REPORT_INTERVAL:
+            last = now
+            out.put(("progress", tag, stats.nodes, depth))
+
+    stats = core.SolveStats(on_node=on_node)
+    start = time.perf_counter()
+    board = bytearray(board)
+    ok = core.SOLVERS[engine or core.SOLVE_ENGINE](board, randomize=seed is not None, stats=stats)
+    out.put(("done", tag, ok, bytes(board) if ok else None, stats.summary(), time.perf_counter() - start))
+
+class SolveJob:
+    """
+    Um Solve/Check em andamento.
+
+    poll() não bloqueia: atualiza attempts/depth e devolve None enquanto roda;
+    no fim devolve o status ("solved", "unsolvable", "timeout", "cancelled" ou
+    "error") e, se resolvido, a solução fica em self.solution. Ao terminar o worker,
+    self.stats guarda o SolveStats.summary() da busca. "error" é quando todos os
+    workers saem sem responder (exceção, processo morto): não prova nada sobre o
+    puzzle, e self.exitcode guarda o código de saída de um deles.
+
+    Com strategies (ex.: PORTFOLIO), roda uma variante por processo e a primeira a terminar decide: todas são buscas
+    completas, então "sem solução" de qualquer uma vale para o puzzle. O nome da
+    vencedora fica em self.winner, entra em wins e, com log, é anexado como uma
+    linha JSON ao arquivo (tamanho, vencedora, tempo, nós) para ajustar os padrões.
+    Durante a busca, attempts/depth mostram a variante mais adiantada.
+    """
+
+    def __init__(self, board, engine=None, timeout=None, strategies=None, log=None):
+        self.timeout  = timeout
+        self.attempts = self.backtracks = self.depth = 0
+        self.elapsed  = 0.0
+        self.solution = None
+        self.stats    = None
+        self.status   = None
+        self.winner   = None
+        self.exitcode = None
+        self.log      = log
+        self.strategies = list(strategies or [(engine or core.SOLVE_ENGINE, engine, None)])
+        self.started  = time.perf_counter()
+        self._queue   = mp.Queue()
+        flat = bytes(core.to_flat(board))
+        self._procs   = [mp.Process(target=_solve_worker, daemon=True,
+                                    args=(flat, core.SIZE, core.BOX_ROWS, eng, seed, tag, self._queue))
+                         for tag, (_, eng, seed) in enumerate(self.strategies)]
+        for p in self._procs: p.start()
+
+    def poll(self):
+        """Consome mensagens pendentes e aplica o timeout; status final ou None."""
+        if self.status: return self.status
+        self.elapsed = time.perf_counter() - self.started
+        while True:
+            try:
+                msg = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == "progress":
+                _, _, attempts, depth = msg
+                if attempts >= self.attempts: self.attempts, self.depth = attempts, depth
+            else:
+                _, tag, ok, solution, self.stats, self.elapsed = msg
+                self.attempts, self.backtracks = self.stats["nodes"], self.stats["backtracks"]
+                if ok: self.solution = core.from_flat(solution)
+                self.winner = self.strategies[tag][0]
+                self._finish("solved" if ok else "unsolvable")
+                if len(self.strategies) > 1: self._record()
+                return self.status
+        if self.timeout is not None and self.elapsed > self.timeout:
+            self._finish("timeout")
+        elif not any(p.is_alive() for p in self._procs) and self._queue.empty():
+            codes = [p.exitcode for p in self._procs]    # workers morreram sem responder
+            self.exitcode = next((c for c in codes if c), codes[0])
+            self._finish("error")
+        return self.status
+
+    def _record(self):
+        """Contabiliza a vencedora do portfólio em wins e, se houver, no arquivo log."""
+        wins[self.winner] += 1
+        if not self.log: return
+        entry = {"size": core.SIZE, "winner": self.winner, "status": self.status,
+                 "elapsed": round(self.elapsed, 6), "nodes": self.attempts,
+                 "strategies": [name for name, _, _ in self.strategies]}
+        with open(self.log, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def cancel(self):
+        """Mata os workers; a busca em andamento é descartada."""
+        if not self.status: self._finish("cancelled")
+
+    def _finish(self, status):
+        self.status = status
+        for p in self._procs:
+            if p.is_alive(): p.terminate()
+        for p in self._procs: p.join(timeout=1)
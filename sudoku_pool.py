@@ -0,0 +1,71 @@
+"""
+Pré-geração de puzzles em segundo plano.
+
+Processos de fundo mantêm uma fila limitada de puzzles prontos para cada tamanho,
+para que o jogo pegue um puzzle na hora em vez de gerar dentro do loop de eventos.
+"""
+import collections, os, random
+from concurrent.futures import ProcessPoolExecutor
+
+import sudoku_core as core
+
+def make_puzzle(size, gen_kwargs):
+    """Tarefa de um worker: gera um puzzle SIZE × SIZE com generate_puzzle(**gen_kwargs)."""
+    if size != core.SIZE: core.configure(size)
+    return core.generate_puzzle(**gen_kwargs)
+
+class PuzzlePool:
+    """
+    Fila de puzzles prontos por tamanho, reabastecida por um pool de processos.
+
+    Chame refill() a cada quadro (não bloqueia), select(size) ao trocar de tamanho
+    – ele passa a ser abastecido primeiro – e take(size) para retirar um puzzle;
+    take devolve None se a fila daquele tamanho ainda estiver vazia.
+    """
+
+    def __init__(self, sizes, per_size=2, workers=None, **gen_kwargs):
+        self.sizes      = list(sizes)
+        self.per_size   = per_size                         # puzzles prontos desejados por tamanho
+        self.workers    = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.gen_kwargs = gen_kwargs
+        self.current    = self.sizes[0]
+        self.ready      = {sz: collections.deque() for sz in self.sizes}
+        self.pending    = {sz: [] for sz in self.sizes}
+        # initializer=random.seed: cada processo com semente própria (fork copiaria o estado)
+        self.executor   = ProcessPoolExecutor(self.workers, initializer=random.seed)
+
+    def select(self, size):
+        """Marca size como tamanho atual: ele é aquecido antes dos demais."""
+        self.current = size
+        self.refill()
+
+    def take(self, size):
+        """Retira um puzzle pronto de size (ou None) e agenda a reposição."""
+        self.refill()
+        puzzle = self.ready[size].popleft() if self.ready[size] else None
+        self.refill()
+        return puzzle
+
+    def refill(self):
+        """Recolhe puzzles terminados e agenda novos, no máximo um por worker em voo."""
+        for sz in self.sizes:
+            for fut in [f for f in self.pending[sz] if f.done()]:
+                self.pending[sz].remove(fut)
+                if not fut.cancelled() and fut.exception() is None:
+                    self.ready[sz].append(fut.result())
+
+        in_flight = sum(len(p) for p in self.pending.values())
+        order = [self.current] + [sz for sz in self.sizes if sz != self.current]
+        for sz in order:
+            while (in_flight < self.workers and
+                   len(self.ready[sz]) + len(self.pending[sz]) < self.per_size):
+                self.pending[sz].append(self.executor.submit(make_puzzle, sz, self.gen_kwargs))
+                in_flight += 1
+
+    def busy(self):
+        """True enquanto houver geração em andamento (refill() ainda tem o que recolher)."""
+        return any(self.pending.values())
+
+    def close(self):
+        """Encerra os workers sem esperar gerações em andamento."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
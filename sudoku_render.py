@@ -0,0 +1,86 @@
+"""
+Cache de renderização das telas do Sudoku (pygame).
+
+Textos são rasterizados uma vez por (fonte, texto, cor) e o fundo com a grade
+vira uma Surface pronta, refeita só quando a geometria muda; a cada quadro
+sobram apenas blits.
+"""
+import pygame as pg
+
+MAX_LABELS = 512            # teto do cache de textos (mensagens de progresso mudam sempre)
+
+_labels = {}                # (fonte, texto, cor) → Surface
+_wraps  = {}                # (fonte, mensagem, largura) → linhas
+
+def clear():
+    """Esquece tudo que foi rasterizado (ex.: fontes trocadas em configure())."""
+    _labels.clear(); _wraps.clear()
+
+def label(font, text, color):
+    """Surface de text em font/color, renderizada só na primeira vez."""
+    key = (font, text, color)
+    img = _labels.get(key)
+    if img is None:
+        if len(_labels) >= MAX_LABELS: _labels.clear()
+        img = _labels[key] = font.render(text, True, color)
+    return img
+
+def glyph_atlas(font, count, color):
+    """Dígitos 1..count pré-renderizados; atlas[n] é a Surface do número n."""
+    return [None] + [label(font, str(n), color) for n in range(1, count + 1)]
+
+def note_surface(glyphs, mask, cell, cols, rows):
+    """
+    Mini-grade de anotações de uma célula cell × cell (fundo transparente): o glifo
+    glyphs[n] de cada dígito n com bit n-1 em mask, na posição n-1 de cols × rows.
+    """
+    surf = pg.Surface((cell, cell), pg.SRCALPHA)
+    w, h = cell / cols, cell / rows
+    n = 1
+    while mask:
+        if mask & 1:
+            i, img = n - 1, glyphs[n]
+            surf.blit(img, img.get_rect(center=(int((i % cols + 0.5) * w), int((i // cols + 0.5) * h))))
+        mask >>= 1; n += 1
+    return surf
+
+def wrap(font, message, width):
+    """Quebra message em linhas com menos de width pixels (resultado em cache)."""
+    key = (font, message, width)
+    lines = _wraps.get(key)
+    if lines is None:
+        if len(_wraps) >= MAX_LABELS: _wraps.clear()
+        lines, cur = [], ""
+        for w in message.split():
+            test = f"{cur} {w}".strip()
+            if font.size(test)[0] < width: cur = test
+            else: lines.append(cur); cur = w
+        lines.append(cur)
+        _wraps[key] = lines
+    return lines
+
+def grid_surface(window_size, topleft, size, cell, box_rows, box_cols, bg, thin, thick):
+    """Fundo da tela de jogo com a grade SIZE × SIZE (linhas grossas nas bordas dos blocos)."""
+    surf = pg.Surface(window_size)
+    surf.fill(bg)
+    bx, by = topleft
+    grid = cell * size
+    pg.draw.rect(surf, thick, (bx, by, grid, grid), 4)
+    for i in range(1, size):
+        y = by + i * cell                            # horizontais
+        pg.draw.line(surf, thick if i % box_rows == 0 else thin,
+                     (bx, y), (bx + grid, y), 4 if i % box_rows == 0 else 1)
+        x = bx + i * cell                            # verticais
+        pg.draw.line(surf, thick if i % box_cols == 0 else thin,
+                     (x, by), (x, by + grid), 4 if i % box_cols == 0 else 1)
+    return surf
+
+def dirty_rects(prev, view):
+    """
+    Retângulos que mudaram entre dois quadros. prev e view mapam chave → (rect, estado);
+    regiões novas, sumidas ou com estado diferente entram na lista.
+    """
+    dirty = [rect for key, (rect, state) in view.items()
+             if key not in prev or prev[key][1] != state]
+    dirty += [rect for key, (rect, _) in prev.items() if key not in view]
+    return dirty
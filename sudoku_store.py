@@ -0,0 +1,200 @@
+"""
+Arquivo binário de puzzles pré-gerados, lido por mmap com acesso aleatório O(1).
+
+Formato (inteiros little-endian):
+
+    cabeçalho   "SDKP", versão (u8), 1 byte livre, nº de seções (u16)
+    índice      por seção: SIZE (u8), BOX_ROWS (u8), bits por célula (u8), 1 byte livre,
+                faixa (12 bytes, ASCII com zeros à direita), nº de puzzles (u64), offset (u64)
+    seções      registros de tamanho fixo, um por puzzle
+
+Cada seção guarda um tamanho e uma faixa de dificuldade (as de sudoku_grade, ou
+"misto"). O registro empacota as SIZE² células com SIZE.bit_length() bits cada
+(4 até 15 × 15, 5 no 18 × 18), então o puzzle i está em offset + i × registro:
+sortear um é um seek, sem ler o arquivo inteiro nem chamar generate_puzzle.
+
+O construtor gera (ou lê de texto, um puzzle por linha) e grava seção por seção
+em fluxo, com memória constante.
+
+    python sudoku_store.py build puzzles.sdk -s 9 12 -b facil medio -n 10000
+    python sudoku_store.py build puzzles.sdk -s 9 --from puzzles9.txt
+    python sudoku_store.py info puzzles.sdk
+    python sudoku_store.py sample puzzles.sdk -s 9 -n 5
+"""
+import argparse, itertools, mmap, multiprocessing as mp, os, random, shutil, struct, sys, tempfile
+
+import sudoku_core as core
+import sudoku_grade
+
+MAGIC   = b"SDKP"
+VERSION = 1
+HEADER  = struct.Struct("<4sBxH")
+SECTION = struct.Struct("<BBBx12sQQ")
+MIXED   = "misto"    # faixa das seções sem classificação
+
+def pack(f, bits):
+    """Tabuleiro plano → registro de ceil(SIZE² × bits / 8) bytes."""
+    value = 0
+    for i, v in enumerate(f): value |= v << (i * bits)
+    return value.to_bytes(-(-len(f) * bits // 8), "little")
+
+def unpack(data, cells, bits):
+    """Inverso de pack: registro → tabuleiro plano com cells células."""
+    value, mask = int.from_bytes(data, "little"), (1 << bits) - 1
+    return bytearray((value >> (i * bits)) & mask for i in range(cells))
+
+class PuzzleStore:
+    """
+    Arquivo de puzzles aberto por mmap (só leitura). Os puzzles saem como
+    tabuleiros planos da geometria da seção – configure o tamanho antes de usá-los.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map  = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close(); raise ValueError(f"{path}: não é um arquivo de puzzles v{VERSION}")
+        self.sections = {}   # (SIZE, faixa) → (BOX_ROWS, bits, puzzles, offset, bytes por registro)
+        for k in range(n):
+            entry = SECTION.unpack_from(self._map, HEADER.size + k * SECTION.size)
+            size, box_rows, bits, band, count, offset = entry
+            record = -(-size * size * bits // 8)
+            if offset + count * record > len(self._map):
+                self.close(); raise ValueError(f"{path}: seção {size}/{band} truncada")
+            self.sections[(size, band.rstrip(b"\0").decode())] = box_rows, bits, count, offset, record
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def close(self):
+        self._map.close(); self._file.close()
+
+    def count(self, size, band=None):
+        """Puzzles de size na faixa band (None = todas)."""
+        return sum(s[2] for (sz, b), s in self.sections.items() if sz == size and band in (None, b))
+
+    def get(self, size, band, i):
+        """i-ésimo puzzle (plano) da seção (size, band)."""
+        _, bits, count, offset, record = self.sections[(size, band)]
+        if not 0 <= i < count: raise IndexError(i)
+        start = offset + i * record
+        return unpack(self._map[start:start + record], size * size, bits)
+
+    def random(self, size, band=None):
+        """Puzzle sorteado de size (na faixa band, ou em qualquer uma); None se não houver."""
+        total = self.count(size, band)
+        if not total: return None
+        i = random.randrange(total)
+        for (sz, b), s in sorted(self.sections.items()):
+            if sz != size or band not in (None, b): continue
+            if i < s[2]: return self.get(sz, b, i)
+            i -= s[2]
+
+def open_store(path):
+    """PuzzleStore de path, ou None se o arquivo não existir ou não for válido."""
+    try:
+        return PuzzleStore(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+def _generate(args):
+    """
+    Tarefa de um worker do construtor: um puzzle (plano) de size na faixa band, ou
+    None se as GRADE_TRIES tentativas de generate_graded não acertarem a faixa.
+    """
+    size, band = args
+    if size != core.SIZE: core.configure(size)
+    if band == MIXED: return core.generate_puzzle(unique=True, flat=True)
+    puzzle, report = sudoku_grade.generate_graded(band, flat=True)
+    return puzzle if report["in_band"] else None
+
+def _read_lines(path, size):
+    """Puzzles de size lidos de um arquivo texto (um por linha); linhas de outro tamanho são puladas."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == size * size: yield core.parse_puzzle(line, flat=True)
+
+def build(path, sections, workers=None, log=None):
+    """
+    Grava o arquivo path. sections: lista de (SIZE, faixa, puzzles), onde puzzles é
+    um iterável de tabuleiros planos ou um inteiro (quantos gerar em paralelo com
+    workers processos). Gerados fora da faixa são descartados, e a seção fica com
+    menos puzzles. O pool só é criado se alguma seção for gerada. Cada seção passa
+    por um temporário em disco, então a memória não cresce com o número de puzzles.
+    """
+    table, parts, pool = [], [], None
+    try:
+        for size, band, puzzles in sections:
+            core.configure(size)
+            if isinstance(puzzles, int):
+                if pool is None: pool = mp.Pool(workers, initializer=random.seed)
+                puzzles = pool.imap_unordered(_generate, itertools.repeat((size, band), puzzles),
+                                              chunksize=16)
+            bits, count, rejected = size.bit_length(), 0, 0
+            tmp = tempfile.TemporaryFile()
+            parts.append(tmp)
+            for f in puzzles:
+                if f is None: rejected += 1; continue
+                tmp.write(pack(f, bits)); count += 1
+            table.append((size, core.BOX_ROWS, bits, band, count))
+            if log:
+                print(f"{size}/{band}: {count} puzzles"
+                      + (f", {rejected} fora da faixa descartados" if rejected else ""), file=log)
+        offset = HEADER.size + SECTION.size * len(table)
+        with open(path + ".tmp", "wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, len(table)))
+            for size, box_rows, bits, band, count in table:
+                out.write(SECTION.pack(size, box_rows, bits, band.encode(), count, offset))
+                offset += count * -(-size * size * bits // 8)
+            for tmp in parts:
+                tmp.seek(0); shutil.copyfileobj(tmp, out)
+        os.replace(path + ".tmp", path)
+    finally:
+        if pool is not None: pool.terminate()             # como ao sair de um with mp.Pool
+        for tmp in parts: tmp.close()
+
+def main(argv=None):
+    ap  = argparse.ArgumentParser(description="Arquivo binário de puzzles pré-gerados.")
+    cmd = ap.add_subparsers(dest="cmd", required=True)
+    b = cmd.add_parser("build", help="gerar (ou importar) puzzles para um arquivo")
+    b.add_argument("path")
+    b.add_argument("-s", "--sizes", type=int, nargs="+", default=core.SIZE_OPTIONS, help="tamanhos")
+    b.add_argument("-b", "--bands", nargs="+", default=[MIXED], choices=[MIXED, *sudoku_grade.BANDS],
+                   help=f"faixas de sudoku_grade ({MIXED} = sem classificar)")
+    b.add_argument("-n", "--count", type=int, default=1000, help="puzzles por tamanho e faixa")
+    b.add_argument("-w", "--workers", type=int, default=None, help="processos geradores")
+    b.add_argument("--from", dest="source", metavar="TXT",
+                   help="importar puzzles deste arquivo texto em vez de gerar (faixa: a 1ª de -b)")
+    i = cmd.add_parser("info", help="listar as seções")
+    i.add_argument("path")
+    s = cmd.add_parser("sample", help="sortear puzzles")
+    s.add_argument("path")
+    s.add_argument("-s", "--size", type=int, default=9)
+    s.add_argument("-b", "--band", default=None)
+    s.add_argument("-n", "--count", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        if args.source:
+            sections = [(sz, args.bands[0], _read_lines(args.source, sz)) for sz in args.sizes]
+        else:
+            sections = [(sz, band, args.count) for sz in args.sizes for band in args.bands]
+        build(args.path, sections, args.workers, log=sys.stderr)
+        return
+    with PuzzleStore(args.path) as store:
+        if args.cmd == "info":
+            for (size, band), (box_rows, bits, count, offset, record) in sorted(store.sections.items()):
+                print(f"{size}x{size} ({box_rows} linhas/bloco) {band}: {count} puzzles, "
+                      f"{record} bytes cada, offset {offset}")
+            return
+        core.configure(args.size)
+        for _ in range(args.count):
+            f = store.random(args.size, args.band)
+            if f is None: sys.exit(f"nenhum puzzle {args.size}x{args.size} em {args.path}")
+            print(core.format_board(f))
+
+if __name__ == "__main__":
+    main()
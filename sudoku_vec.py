@@ -0,0 +1,122 @@
+"""
+API vetorizada (NumPy) para lotes de tabuleiros da geometria atual.
+
+Os tabuleiros vêm num array inteiro (N, SIZE, SIZE) com 0 nas vazias. Conflitos,
+candidatos e propagação de singles são feitos para o lote inteiro com reduções por
+linha, coluna e bloco (os blocos saem de um reshape por BOX_ROWS × BOX_COLS);
+só o que a propagação não resolve desce para o solver escalar do sudoku_core.
+Máscaras seguem o núcleo: bit n-1 ⇒ dígito n.
+
+    a = sudoku_vec.from_boards(boards)
+    sol, ok = sudoku_vec.solve_batch(a)
+"""
+import numpy as np
+
+import sudoku_core as core
+
+def from_boards(boards):
+    """Lista de tabuleiros (listas ou planos) → array (N, SIZE, SIZE) uint8."""
+    flat = b"".join(bytes(core.to_flat(b)) for b in boards)
+    return np.frombuffer(flat, dtype=np.uint8).reshape(-1, core.SIZE, core.SIZE).copy()
+
+def to_flats(a):
+    """Inverso de from_boards, em tabuleiros planos (bytearray)."""
+    return [bytearray(b.astype(np.uint8).tobytes()) for b in a]
+
+def boxes(a):
+    """Reordena (N, SIZE, SIZE, …) para que o eixo 1 seja o bloco e o eixo 2 a célula dentro dele."""
+    n, S, rest = a.shape[0], core.SIZE, a.shape[3:]
+    a = a.reshape(n, S // core.BOX_ROWS, core.BOX_ROWS, S // core.BOX_COLS, core.BOX_COLS, *rest)
+    return a.swapaxes(2, 3).reshape(n, S, S, *rest)
+
+def unboxes(a):
+    """Inverso de boxes."""
+    n, S, rest = a.shape[0], core.SIZE, a.shape[3:]
+    a = a.reshape(n, S // core.BOX_ROWS, S // core.BOX_COLS, core.BOX_ROWS, core.BOX_COLS, *rest)
+    return a.swapaxes(2, 3).reshape(n, S, S, *rest)
+
+def _onehot(a):
+    """(N, SIZE, SIZE) → (N, SIZE, SIZE, SIZE) bool: [..., d] ⇔ célula tem o dígito d+1."""
+    return a[..., None] == np.arange(1, core.SIZE + 1, dtype=a.dtype)
+
+def conflicts(a):
+    """
+    Conflitos do lote: (por tabuleiro (N,) bool, por célula (N, SIZE, SIZE) bool).
+    Uma célula conflita se o dígito dela aparece mais de uma vez em alguma de suas unidades.
+    """
+    hot = _onehot(a).astype(np.uint8)
+    rows = hot.sum(axis=2, keepdims=True) > 1              # (N, SIZE, 1, SIZE) linha × dígito
+    cols = hot.sum(axis=1, keepdims=True) > 1              # (N, 1, SIZE, SIZE) coluna × dígito
+    bxs  = unboxes(np.broadcast_to(boxes(hot).sum(axis=2, keepdims=True) > 1, hot.shape))
+    cell = ((rows | cols | bxs) & hot.astype(bool)).any(axis=3)
+    return cell.any(axis=(1, 2)), cell
+
+def candidates(a):
+    """Máscara de candidatos de cada célula (N, SIZE, SIZE) int32; 0 nas preenchidas."""
+    bits = np.where(a > 0, np.left_shift(1, a.astype(np.int32) - 1), 0).astype(np.int32)
+    used = (np.bitwise_or.reduce(bits, axis=2)[:, :, None]
+            | np.bitwise_or.reduce(bits, axis=1)[:, None, :]
+            | unboxes(np.broadcast_to(np.bitwise_or.reduce(boxes(bits), axis=2)[:, :, None], bits.shape)))
+    return np.where(a > 0, 0, ~used & ((1 << core.SIZE) - 1)).astype(np.int32)
+
+def _singles(a):
+    """
+    Uma rodada de singles sobre o lote a: (colocações (N, SIZE, SIZE), dead (N,) bool).
+    dead marca contradição – célula vazia sem candidato, dígito que não está nem cabe
+    numa unidade, ou célula que é a única casa de dois dígitos.
+    """
+    cand  = candidates(a)
+    empty = a == 0
+    has   = (cand[..., None] >> np.arange(core.SIZE, dtype=np.int32)) & 1 == 1  # d+1 é candidato
+    done  = _onehot(a)
+    spread = lambda x: np.broadcast_to(x, has.shape)
+    dead = (empty & (cand == 0)).any(axis=(1, 2))
+    for have, put in ((has.any(axis=2), done.any(axis=2)),
+                      (has.any(axis=1), done.any(axis=1)),
+                      (boxes(has).any(axis=2), boxes(done).any(axis=2))):
+        dead |= (~(have | put)).any(axis=(1, 2))
+    # hidden singles: única casa do dígito na linha, coluna ou bloco
+    hidden = has & (spread(has.sum(axis=2, keepdims=True) == 1)
+                    | spread(has.sum(axis=1, keepdims=True) == 1)
+                    | unboxes(spread(boxes(has).sum(axis=2, keepdims=True) == 1)))
+    dead |= (hidden.sum(axis=3) > 1).any(axis=(1, 2))
+    place = np.where(hidden.any(axis=3), hidden.argmax(axis=3) + 1, 0)
+    # naked singles: um único candidato (se também for hidden, é o mesmo dígito)
+    naked = empty & (cand != 0) & ((cand & (cand - 1)) == 0)
+    return np.where(naked, np.bitwise_count(cand - 1) + 1, place).astype(a.dtype), dead
+
+def propagate(a):
+    """
+    Naked e hidden singles no lote inteiro até estabilizar (altera a no lugar).
+    Cada rodada só recalcula os tabuleiros que ainda mudam. Devolve dead (N,) bool:
+    tabuleiros em contradição (ver _singles) ou com colocações da mesma rodada se chocando
+    (conferido uma vez no fim – a repetição não some, então não precisa checar a cada rodada).
+    """
+    dead = conflicts(a)[0]
+    act  = np.flatnonzero(~dead)                 # tabuleiros ainda em propagação
+    while act.size:
+        place, bad = _singles(a[act])
+        dead[act[bad]] = True
+        moved = ~bad & place.any(axis=(1, 2))
+        act = act[moved]
+        a[act] += place[moved]
+    live = np.flatnonzero(~dead)
+    dead[live[conflicts(a[live])[0]]] = True
+    return dead
+
+def solve_batch(a, engine=None, stats=None):
+    """
+    Resolve o lote a (N, SIZE, SIZE): propagação vetorizada para todos e solver escalar
+    (engine, padrão SOLVE_ENGINE) só para os que sobrarem incompletos.
+    Devolve (soluções (N, SIZE, SIZE), ok (N,) bool); stats (SolveStats) acumula as buscas escalares.
+    """
+    sol  = np.array(a, dtype=np.uint8)
+    dead = propagate(sol)
+    ok   = ~dead & (sol > 0).all(axis=(1, 2))
+    solve = core.SOLVERS[engine or core.SOLVE_ENGINE]
+    for i in np.flatnonzero(~dead & ~ok):                   # a busca fica só para estes
+        f = bytearray(sol[i].tobytes())
+        if solve(f, stats=stats):
+            sol[i] = np.frombuffer(f, dtype=np.uint8).reshape(core.SIZE, core.SIZE)
+            ok[i] = True
+    return sol, ok